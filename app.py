@@ -1,8 +1,40 @@
+import os
+
 import streamlit as st
-# Define the navigation menu
-pg = st.navigation([
-      st.Page("pages/page.py", title="notes", icon="🔸")
-])
+
+from pages.context import sidebar_selection
+from pages.profiling import begin_run
+from pages.warmup import cache_warmer
+
+# Every stage below is recorded against this rerun
+begin_run()
+
+# Start (once per server process) the background job that precomputes and
+# periodically refreshes the shared caches
+cache_warmer()
+
+# The sidebar lives in the entrypoint so the currency and filters persist across sections
+sidebar_selection()
+
+# The performance page is hidden: opening the app with ?debug=1 (or setting
+# SALES_DEBUG_PAGE) registers it for the rest of the session
+if st.query_params.get('debug') == '1' or os.environ.get('SALES_DEBUG_PAGE'):
+    st.session_state['debug'] = True
+
+# Define the navigation menu: each analysis is its own page, so only the section
+# being viewed runs (and only its charts are built)
+pages = [
+      st.Page("pages/page.py", title="notes", icon="🔸", default=True),
+      st.Page("pages/trends.py", title="Revenue trends", icon="📅"),
+      st.Page("pages/farms.py", title="Farms & livestock", icon="🐄"),
+      st.Page("pages/channels.py", title="Sales channels", icon="🏪"),
+      st.Page("pages/products.py", title="Products & shelf life", icon="🧀"),
+      st.Page("pages/stock.py", title="At-risk inventory", icon="📦"),
+      st.Page("pages/takeaways.py", title="Key takeaways", icon="🎯"),
+]
+if st.session_state.get('debug'):
+    pages.append(st.Page("pages/profiler.py", title="Performance", icon="⏱️"))
+pg = st.navigation(pages)
 
 # Run the navigation system
-pg.run()
\ No newline at end of file
+pg.run()
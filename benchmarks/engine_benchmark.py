@@ -0,0 +1,116 @@
+"""Query-engine benchmark: pandas (in-process frame) vs. SQLite (embedded database file).
+
+Run from the project root:
+
+    python -m benchmarks.engine_benchmark                    # bundled data + 100k, 1M, 10M rows
+    python -m benchmarks.engine_benchmark --sizes 100000 1000000 --repeat 5
+
+For each dataset size both engines are prepared once (pandas: load the frame
+and build the SalesIndex; SQLite: build the indexed database file), then the
+same filter states are answered repeatedly without any result caching. The
+summary reports, per filter state, the smallest size from which SQLite keeps
+answering faster than pandas: the crossover point.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import pandas as pd
+
+from benchmarks.run import synthetic_dataset
+from pages.cube import build_cube, shelf_life_counts
+from pages.data import DATA_PATH, add_derived_columns, read_csv_typed
+from pages.engines import build_database, query_cube
+from pages.filters import Filters, SalesIndex
+
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+
+
+def filter_states(index):
+    """Representative filter states, from the whole dataset down to a narrow slice."""
+    first, _ = index.date_bounds()
+    location = index.options('Location')[0]
+    return {
+        'all rows': Filters(),
+        'one year': Filters(start=first, end=first + pd.DateOffset(years=1, days=-1)),
+        'one location': Filters(locations=(location,)),
+        'location+channel+month': Filters(start=first, end=first + pd.DateOffset(months=1, days=-1),
+                                          locations=(location,), channels=('Online',)),
+    }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def median_seconds(func, repeat):
+    return statistics.median(timed(func)[1] for _ in range(repeat))
+
+
+def bench_engines(path, repeat=3):
+    """Prepare both engines over one dataset and time every filter state on each."""
+    index, pandas_prepare = timed(lambda: SalesIndex(add_derived_columns(read_csv_typed(path))))
+    db_path = os.path.splitext(path)[0] + '.sqlite'
+    _, sqlite_prepare = timed(build_database, path, db_path)
+
+    def pandas_query(filters):
+        rows = index.rows(filters)
+        return build_cube(rows), shelf_life_counts(rows)
+
+    queries = []
+    for name, filters in filter_states(index).items():
+        queries.append({
+            'filters': name,
+            'pandas': median_seconds(lambda: pandas_query(filters), repeat),
+            'sqlite': median_seconds(lambda: query_cube(db_path, filters), repeat),
+        })
+    return {
+        'dataset': os.path.basename(path),
+        'rows': len(index.df),
+        'prepare': {'pandas': pandas_prepare, 'sqlite': sqlite_prepare},
+        'resident_mb': {'pandas': index.df.memory_usage(deep=True).sum() / 2**20,
+                        'sqlite_file': os.path.getsize(db_path) / 2**20},
+        'queries': queries,
+    }
+
+
+def crossover(runs):
+    """Per filter state, the smallest dataset size from which SQLite stays faster than pandas."""
+    points = {}
+    for run in sorted(runs, key=lambda r: r['rows']):
+        for query in run['queries']:
+            if query['sqlite'] >= query['pandas']:
+                points[query['filters']] = None
+            elif points.get(query['filters']) is None:
+                points[query['filters']] = run['rows']
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help="synthetic dataset sizes in rows (the bundled CSV is always included)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    runs = []
+    for path in [DATA_PATH] + [synthetic_dataset(rows) for rows in args.sizes]:
+        run = bench_engines(path, args.repeat)
+        runs.append(run)
+        print(f"\n{run['dataset']} ({run['rows']:,} rows)")
+        print(f"  prepare      pandas {run['prepare']['pandas']:8.2f} s   sqlite {run['prepare']['sqlite']:8.2f} s")
+        print(f"  footprint    pandas {run['resident_mb']['pandas']:8.1f} MB  "
+              f"sqlite {run['resident_mb']['sqlite_file']:8.1f} MB on disk")
+        for query in run['queries']:
+            print(f"  {query['filters']:<24}pandas {query['pandas']:8.4f} s   sqlite {query['sqlite']:8.4f} s")
+
+    print("\nCrossover (smallest size from which SQLite stays faster):")
+    for name, rows in crossover(runs).items():
+        print(f"  {name:<24}{'not reached' if rows is None else f'{rows:,} rows'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Cold-load benchmark: untyped and typed CSV parse vs. memory-mapped Parquet snapshot.
+
+Run from the project root:
+
+    python -m benchmarks.load_benchmark [path/to/file.csv] [--repeat N]
+
+Each measurement runs in a fresh interpreter so that neither the OS-level
+import cost nor a previous load's allocations leak into the numbers. The
+'untyped' row is a plain pd.read_csv, i.e. the frame before the schema; the
+'loaded' row is the snapshot plus the derived calendar and currency columns,
+i.e. what a worker keeps. The last column is each frame's size relative to
+the untyped one (how much smaller it is).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from pages.data import DATA_PATH, snapshot_is_fresh, write_snapshot
+
+# Executed in a child process: load one way, report wall time and peak RSS
+_CHILD = """
+import json, resource, sys, time
+import pandas as pd
+import pages.data as data
+path, mode = sys.argv[1], sys.argv[2]
+load = {
+    'untyped': pd.read_csv, 'csv': data.read_csv_typed, 'parquet': data.read_snapshot,
+    'loaded': lambda path: data.add_derived_columns(data.read_snapshot(path)),
+}[mode]
+start = time.perf_counter()
+df = load(path)
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+frame = df.memory_usage(index=False, deep=True).sum()
+print(json.dumps({'seconds': elapsed, 'peak_rss_mb': peak / 1024, 'frame_mb': frame / 2**20, 'rows': len(df)}))
+"""
+
+
+def measure(path, mode):
+    """Run a single cold load in a child interpreter and return its stats."""
+    out = subprocess.run(
+        [sys.executable, '-c', _CHILD, path, mode],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', nargs='?', default=DATA_PATH)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if not snapshot_is_fresh(args.path):
+        write_snapshot(args.path)
+
+    print(f"{'path':<10}{'rows':>10}{'median s':>12}{'peak RSS MB':>14}{'frame MB':>11}{'vs untyped':>12}")
+    untyped = None
+    for mode in ('untyped', 'csv', 'parquet', 'loaded'):
+        runs = [measure(args.path, mode) for _ in range(args.repeat)]
+        untyped = untyped or runs[0]['frame_mb']
+        print(
+            f"{mode:<10}{runs[0]['rows']:>10,}"
+            f"{statistics.median(r['seconds'] for r in runs):>12.4f}"
+            f"{max(r['peak_rss_mb'] for r in runs):>14.1f}"
+            f"{runs[0]['frame_mb']:>11.1f}"
+            f"{untyped / runs[0]['frame_mb']:>11.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Serial vs. process-pool aggregation of the sales cube.
+
+Run from the project root:
+
+    python -m benchmarks.parallel_benchmark                          # 1M rows, 1/2/4/8 workers
+    python -m benchmarks.parallel_benchmark --sizes 10000000 --workers 1 8 --partition-by Year
+
+For each dataset the serial build_cube + shelf_life_counts path is timed, then
+the same aggregation partitioned (into equal row ranges, by Year or by
+Location) and run in a pool of worker processes over shared-memory columns.
+Every parallel result is checked against the serial one before its speedup is
+reported. Pool start-up is excluded: the pool is warmed with one untimed run.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+
+from benchmarks.run import synthetic_dataset
+from pages.cube import CUBE_KEYS, MEASURES, SHELF_LIFE_KEYS, aggregate
+from pages.data import DATA_PATH, add_derived_columns, read_csv_typed
+from pages.parallel import CORES
+
+DEFAULT_SIZES = [1_000_000]
+DEFAULT_WORKERS = [1, 2, 4, 8]
+PARTITIONS = {'rows': None, 'Year': 'Year', 'Location': 'Location'}
+
+
+def median_seconds(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def same_result(expected, actual):
+    """Counts and keys identical, measures equal up to float summation order."""
+    for table, keys, measures in ((0, CUBE_KEYS, MEASURES), (1, SHELF_LIFE_KEYS, ['Rows'])):
+        a = expected[table].sort_values(keys).reset_index(drop=True)
+        b = actual[table].sort_values(keys).reset_index(drop=True)
+        if len(a) != len(b) or not (a[keys].astype(str) == b[keys].astype(str)).all().all():
+            return False
+        if not all(np.allclose(a[m], b[m]) for m in measures):
+            return False
+    return True
+
+
+def bench(path, workers_list, partitions, repeat):
+    df = add_derived_columns(read_csv_typed(path))
+    print(f"\n{os.path.basename(path)} ({len(df):,} rows)")
+    serial, expected = median_seconds(lambda: aggregate(df, workers=1), repeat)
+    print(f"  {'serial':<24}{serial:>9.3f} s")
+    for label in partitions:
+        for workers in workers_list:
+            if workers <= 1:
+                continue
+            aggregate(df, workers=workers, partition_by=PARTITIONS[label])  # start the pool's processes
+            seconds, result = median_seconds(lambda: aggregate(df, workers=workers, partition_by=PARTITIONS[label]),
+                                             repeat)
+            check = 'ok' if same_result(expected, result) else 'MISMATCH'
+            print(f"  {f'{label} x {workers} workers':<24}{seconds:>9.3f} s   speedup {serial / seconds:5.2f}   {check}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help="synthetic dataset sizes in rows (the bundled CSV is always included)")
+    parser.add_argument('--workers', type=int, nargs='*', default=DEFAULT_WORKERS)
+    parser.add_argument('--partition-by', choices=list(PARTITIONS), nargs='*', default=list(PARTITIONS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"CPU cores available: {CORES}")
+    if max(args.workers) > CORES:
+        print("(more workers than cores: expect no speedup beyond the core count)")
+    for path in [DATA_PATH] + [synthetic_dataset(rows) for rows in args.sizes]:
+        bench(path, args.workers, args.partition_by, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
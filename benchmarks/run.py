@@ -0,0 +1,174 @@
+"""Headless, per-stage benchmark of the dashboard's data and render paths.
+
+Run from the project root:
+
+    python -m benchmarks.run                               # bundled data + 100k, 1M, 10M rows
+    python -m benchmarks.run --sizes 100000                # pick the synthetic sizes
+    python -m benchmarks.run --baseline benchmarks/results/<earlier>.json
+
+Every stage the page goes through (CSV load, date parsing, currency conversion,
+cube aggregation, the farm tables, each chart rollup and each Plotly figure) is timed separately
+with its peak traced memory, and each figure's JSON payload size is recorded.
+Results are written as JSON to benchmarks/results/ so runs can be compared for
+regressions. Memory tracing adds overhead to the timings; use --no-memory for
+clean wall times.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import generate
+from pages import charts
+from pages.cube import build_cube, headline_kpis, shelf_life_counts
+from pages.currency import add_currency_columns, load_rates
+from pages.data import DATA_PATH, DATE_COLUMNS, DTYPES, add_calendar_columns
+from pages.efficiency import farm_efficiency, farm_table, sales_table
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+SYNTHETIC_DIR = os.path.join(BENCH_DIR, 'data')
+
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+
+# Text dtypes for the raw CSV parse, so date parsing can be timed on its own
+TEXT_DTYPES = {**DTYPES, **{column: 'str' for column in DATE_COLUMNS}}
+
+
+def synthetic_dataset(rows, seed=0):
+    """Path to a CSV of `rows` rows with the bundled schema, generated once and reused."""
+    path = os.path.join(SYNTHETIC_DIR, f'dairy_{rows}.csv')
+    if not os.path.exists(path):
+        generate(path, rows, seed=seed)
+    return path
+
+
+class StageTimer:
+    """Collects wall time and peak traced memory for each named stage.
+
+    tracemalloc slows allocation-heavy stages down; pass trace_memory=False
+    for clean wall times (peak_mb is then reported as None).
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = []
+
+    def run(self, name, func, *args, **kwargs):
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        peak = None
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        self.stages.append({'stage': name, 'seconds': seconds, 'peak_mb': peak})
+        return result
+
+
+def parse_dates(df):
+    for column in DATE_COLUMNS:
+        df[column] = pd.to_datetime(df[column], format='%Y-%m-%d')
+    return df
+
+
+def bench_dataset(path, currency='EUR', trace_memory=True):
+    """Run every stage of the page over one dataset file."""
+    timer = StageTimer(trace_memory)
+    df = timer.run('csv_load', pd.read_csv, path, dtype=TEXT_DTYPES)
+    rows = len(df)
+    df = timer.run('date_parse', parse_dates, df)
+    df = timer.run('calendar_columns', add_calendar_columns, df)
+    rates = load_rates()
+    df = timer.run('currency_conversion', add_currency_columns, df, rates)
+    cube = timer.run('cube_build', build_cube, df)
+    shelf_life = timer.run('shelf_life_counts', shelf_life_counts, df)
+    timer.run('kpis', headline_kpis, cube, currency=currency)
+
+    for name in charts.CHART_DATASETS:
+        timer.run(f'rollup:{name}', getattr(charts, name), cube, currency)
+    timer.run('rollup:shelf_life_distribution', charts.shelf_life_distribution, shelf_life)
+    farms = timer.run('farm_table', farm_table, df)
+    sales = timer.run('farm_sales_table', sales_table, df)
+    efficiency = timer.run('rollup:farm_efficiency', farm_efficiency, farms, sales, currency)
+
+    # chart id -> (builder, args); the revenue-per-cow figure is built from the farm tables, not the cube
+    figures = {chart_id: (builder, (cube, shelf_life, currency, 'Online') if chart_id == 'top_farm_channel_pie'
+                          else (cube, shelf_life, currency))
+               for chart_id, builder in charts.CHARTS.items()}
+    figures['revenue_per_cow'] = (charts.revenue_per_cow_chart, (efficiency, currency))
+    for chart_id, (builder, args) in figures.items():
+        fig = timer.run(f'figure:{chart_id}', builder, *args)
+        payload = timer.run(f'to_json:{chart_id}', fig.to_json)
+        timer.stages[-1]['payload_kb'] = len(payload) / 1024  # what the browser has to download and parse
+
+    return {'dataset': os.path.basename(path), 'rows': rows, 'cube_rows': len(cube), 'stages': timer.stages}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Print per-stage time ratios against an earlier results file."""
+    before = {(r['rows'], s['stage']): s['seconds'] for r in baseline['runs'] for s in r['stages']}
+    print(f"\n{'rows':>12}  {'stage':<40}{'before s':>10}{'after s':>10}{'ratio':>8}")
+    for run in results['runs']:
+        for stage in run['stages']:
+            old = before.get((run['rows'], stage['stage']))
+            if old:
+                print(f"{run['rows']:>12,}  {stage['stage']:<40}{old:>10.4f}{stage['seconds']:>10.4f}"
+                      f"{stage['seconds'] / old:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help="synthetic dataset sizes in rows (the bundled CSV is always included)")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--baseline', help="earlier results file to compare against")
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc for undisturbed wall times")
+    args = parser.parse_args()
+
+    paths = [DATA_PATH] + [synthetic_dataset(rows) for rows in args.sizes]
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'trace_memory': not args.no_memory,
+        'runs': [],
+    }
+    for path in paths:
+        run = bench_dataset(path, trace_memory=not args.no_memory)
+        results['runs'].append(run)
+        print(f"\n{run['dataset']} ({run['rows']:,} rows, {run['cube_rows']:,} cube cells)")
+        for stage in run['stages']:
+            memory = '' if stage['peak_mb'] is None else f"{stage['peak_mb']:>10.1f} MB"
+            payload = f"{stage['payload_kb']:>10.1f} KB" if 'payload_kb' in stage else ''
+            print(f"  {stage['stage']:<40}{stage['seconds']:>10.4f} s{memory}{payload}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['timestamp'].replace(':', '')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
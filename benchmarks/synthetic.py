@@ -0,0 +1,197 @@
+"""Synthetic dairy sales generator that scales the bundled schema to millions of rows.
+
+Run from the project root:
+
+    python -m benchmarks.synthetic --rows 10000000 --output benchmarks/data/dairy_10M.csv
+    python -m benchmarks.synthetic --rows 100000000 --format parquet --output benchmarks/data/dairy_100M.parquet
+    python -m benchmarks.synthetic --rows 5000000 --split --output benchmarks/data/parts/
+
+The column distributions are learned from data/dairy_dataset.csv: category
+frequencies (jointly for product, product id, brand and storage condition),
+empirical quantiles for the numeric columns, shelf-life range per product and
+the production-to-sale lag. The derived columns (Total Value, revenue,
+expiration date, stock) keep the same arithmetic relations as the source.
+Rows are generated in vectorized chunks and written as they are produced, so
+memory is bounded by --chunk-rows whatever the total size.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from pages.data import DATA_PATH, DATE_COLUMNS, read_csv_typed
+
+# Quantile grid used to store each learned numeric distribution
+_QUANTILES = np.linspace(0, 1, 201)
+
+# Columns sampled together, so only combinations seen in the source are produced
+PRODUCT_COLUMNS = ['Product Name', 'Product ID', 'Brand', 'Storage Condition']
+
+# Independent categorical columns
+CATEGORY_COLUMNS = ['Location', 'Farm Size', 'Customer Location', 'Sales Channel']
+
+# Independent numeric columns, sampled from their empirical quantiles
+NUMERIC_COLUMNS = [
+    'Total Land Area (acres)',
+    'Number of Cows',
+    'Quantity (liters/kg)',
+    'Price per Unit',
+    'Minimum Stock Threshold (liters/kg)',
+    'Reorder Quantity (liters/kg)',
+]
+
+
+class DairyModel:
+    """Column distributions learned from a sample of the dairy dataset."""
+
+    def fit(self, df):
+        self.columns = list(df.columns)
+        combos = df.groupby(PRODUCT_COLUMNS, observed=True).size()
+        self.products = combos.index.to_frame(index=False)
+        self.product_p = (combos / combos.sum()).to_numpy()
+        shelf = df.groupby('Product Name', observed=True)['Shelf Life (days)'].agg(['min', 'max'])
+        self.shelf_min = shelf['min'].reindex(self.products['Product Name']).to_numpy()
+        self.shelf_max = shelf['max'].reindex(self.products['Product Name']).to_numpy()
+
+        self.categories = {}
+        for column in CATEGORY_COLUMNS:
+            counts = df[column].value_counts()
+            self.categories[column] = (counts.index.astype(str).to_numpy(), (counts / counts.sum()).to_numpy())
+
+        self.quantiles = {column: df[column].quantile(_QUANTILES).to_numpy() for column in NUMERIC_COLUMNS}
+        # Ratios and lags that tie the derived columns together
+        self.quantiles['sold_ratio'] = (df['Quantity Sold (liters/kg)'] / df['Quantity (liters/kg)']).quantile(_QUANTILES).to_numpy()
+        self.quantiles['price_ratio'] = (df['Price per Unit (sold)'] / df['Price per Unit']).quantile(_QUANTILES).to_numpy()
+        self.quantiles['lag_days'] = (df['Date'] - df['Production Date']).dt.days.quantile(_QUANTILES).to_numpy()
+        self.first_date, self.last_date = df['Date'].min(), df['Date'].max()
+        return self
+
+    def _numeric(self, column, rng, n):
+        """Inverse-CDF sample from the learned quantiles (linear between grid points)."""
+        # The quantile grid is uniform, so the bracketing point is found by scaling, not searching
+        q = self.quantiles[column]
+        position = rng.random(n) * (len(q) - 1)
+        i = np.minimum(position.astype(np.int64), len(q) - 2)
+        return q[i] + (position - i) * (q[i + 1] - q[i])
+
+    def _category(self, column, rng, n):
+        values, p = self.categories[column]
+        return pd.Categorical.from_codes(rng.choice(len(values), n, p=p), categories=values)
+
+    def sample(self, n, rng):
+        """Generate n rows with the source schema (column order and dtypes)."""
+        out = {}
+        for column in CATEGORY_COLUMNS:
+            out[column] = self._category(column, rng, n)
+
+        combo = rng.choice(len(self.products), n, p=self.product_p)
+        for column in PRODUCT_COLUMNS:
+            values = self.products[column]
+            if column == 'Product ID':
+                out[column] = values.to_numpy()[combo]
+            else:
+                categories = pd.Index(values.astype(str).unique())
+                out[column] = pd.Categorical.from_codes(categories.get_indexer(values.astype(str))[combo],
+                                                        categories=categories)
+
+        # Shelf life uniformly within the product's observed range
+        low, high = self.shelf_min[combo], self.shelf_max[combo]
+        shelf_life = low + np.floor(rng.random(n) * (high - low + 1)).astype(np.int64)
+        out['Shelf Life (days)'] = shelf_life
+
+        for column in NUMERIC_COLUMNS:
+            out[column] = self._numeric(column, rng, n).round(2)
+        out['Number of Cows'] = out['Number of Cows'].round().astype(np.int64)
+
+        # Dates as day numbers, converted once at the end
+        first = self.first_date.to_datetime64().astype('datetime64[D]').astype(np.int64)
+        span = (self.last_date - self.first_date).days + 1
+        date = first + rng.integers(0, span, n)
+        production = date - self._numeric('lag_days', rng, n).round().astype(np.int64)
+        for column, days in (('Date', date), ('Production Date', production),
+                             ('Expiration Date', production + shelf_life)):
+            out[column] = days.astype('datetime64[D]').astype('datetime64[s]')
+
+        quantity, price = out['Quantity (liters/kg)'], out['Price per Unit']
+        sold = np.floor(quantity * self._numeric('sold_ratio', rng, n)).astype(np.int64)
+        sold_price = (price * self._numeric('price_ratio', rng, n)).round(2)
+        out['Total Value'] = (quantity * price).round(4)
+        out['Quantity Sold (liters/kg)'] = sold
+        out['Price per Unit (sold)'] = sold_price
+        out['Approx. Total Revenue(INR)'] = (sold * sold_price).round(2)
+        out['Quantity in Stock (liters/kg)'] = np.floor(quantity - sold).astype(np.int64)
+        return pd.DataFrame(out)[self.columns]
+
+
+def learn(path=DATA_PATH):
+    """Fit a DairyModel on the bundled (or any schema-identical) CSV."""
+    return DairyModel().fit(read_csv_typed(path))
+
+
+def _to_arrow(chunk):
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    # Plain YYYY-MM-DD dates, as in the source CSV
+    for column in DATE_COLUMNS:
+        i = table.schema.get_field_index(column)
+        table = table.set_column(i, column, table.column(column).cast(pa.timestamp('s')).cast(pa.date32()))
+    return table
+
+
+def iter_chunks(model, rows, chunk_rows=1_000_000, seed=0):
+    """Yield generated chunks until `rows` rows have been produced."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        yield model.sample(min(chunk_rows, rows - start), rng)
+
+
+def generate(output, rows, fmt='csv', chunk_rows=1_000_000, split=False, seed=0, model=None):
+    """Stream `rows` synthetic rows to `output` (a file, or a directory of part files if split)."""
+    model = model or learn()
+    if split:
+        os.makedirs(output, exist_ok=True)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    writer = None
+    try:
+        for i, chunk in enumerate(iter_chunks(model, rows, chunk_rows, seed)):
+            table = _to_arrow(chunk)
+            if split:
+                part = os.path.join(output, f'part-{i:05d}.{fmt}')
+                if fmt == 'csv':
+                    pacsv.write_csv(table, part)
+                else:
+                    pq.write_table(table, part)
+                continue
+            if writer is None:
+                writer = pacsv.CSVWriter(output, table.schema) if fmt == 'csv' else pq.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--output', required=True, help="output file, or directory with --split")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000)
+    parser.add_argument('--split', action='store_true', help="write one part file per chunk")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--source', default=DATA_PATH, help="CSV to learn the distributions from")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate(args.output, args.rows, args.format, args.chunk_rows, args.split, args.seed, learn(args.source))
+    print(f"Wrote {args.rows:,} rows to {args.output} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,312 @@
+import functools
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
 
+import numpy as np
+import pandas as pd
 import streamlit as st
-import time
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# On-disk tier, shared by every worker process on the box and surviving restarts
+CACHE_DIR = os.environ.get(
+    'SALES_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache'),
+)
+
+# Set SALES_DISK_CACHE=0 to keep every cache in memory only
+DISK_CACHE = os.environ.get('SALES_DISK_CACHE', '1') != '0'
+
+# Default size limit of each on-disk cache
+DISK_CACHE_BYTES = int(os.environ.get('SALES_DISK_CACHE_MB', 2048)) * 2**20
+
+# Bump to discard every on-disk entry after a change CODE_VERSION cannot see
+CACHE_VERSION = 1
+
+
+def code_version():
+    """Fingerprint of the code and libraries the cached values are built with.
+
+    The sources of every module in pages/ (measures, keys, dtypes...) and the
+    pandas and numpy versions (pickled frames keep the dtypes they had).
+    """
+    digest = hashlib.sha1(f'{CACHE_VERSION}-{pd.__version__}-{np.__version__}'.encode())
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# Part of every on-disk key, so after a deploy or an upgrade old pickles are
+# never read back; they age out through the size limit instead
+CODE_VERSION = code_version()
+
+# Every named cache in the process, for the counters on the performance page
+CACHES = {}
+
+_MISSING = object()
+
+
+def estimate_size(value):
+    """Approximate bytes held by a cached value (frames are measured deeply)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache shared by every session in the process.
+
+    Bounded by entry count and, optionally, by the estimated bytes of the
+    values (`max_bytes`); entries older than `ttl` seconds are dropped on
+    access. Hits, misses, evictions and expirations are counted.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=None, ttl=None, name=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.counters = dict.fromkeys(['hits', 'misses', 'evictions', 'expirations'], 0)
+        self._entries = OrderedDict()  # key -> (value, size, stored at)
+        self._lock = threading.Lock()
+        if name:
+            CACHES[name] = self
+
+    def _pop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def _lookup(self, key):
+        """The live value for key, or _MISSING; expired entries are dropped. Caller holds the lock."""
+        if key not in self._entries:
+            return _MISSING
+        value, _, stored_at = self._entries[key]
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            self._pop(key)
+            self.counters['expirations'] += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+            self.counters['misses' if value is _MISSING else 'hits'] += 1
+            return default if value is _MISSING else value
+
+    def put(self, key, value):
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._entries[key] = (value, size, time.time())
+            self.bytes += size
+            # Evict the least recently used entries beyond the bounds
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                self._pop(next(iter(self._entries)))
+                self.counters['evictions'] += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {**self.counters, 'entries': len(self), 'bytes': self.bytes}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """Pickled values in a directory, one file per key, written atomically.
+
+    Safe to share between processes. Reads refresh a file's mtime, so the
+    size limit evicts the least recently used files first; `ttl` counts from
+    when the value was stored. Keys include `version` (the code version by
+    default), so values written by other code are never read back.
+    """
+
+    def __init__(self, directory, max_bytes=DISK_CACHE_BYTES, ttl=None, version=CODE_VERSION):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = version
+        self.counters = dict.fromkeys(['hits', 'misses', 'evictions', 'expirations', 'errors'], 0)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr((self.version, key)).encode()).hexdigest() + '.pkl')
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_at, value = pickle.load(f)
+        except FileNotFoundError:
+            self.counters['misses'] += 1
+            return default
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+            # Unreadable or written by an incompatible version of the code: recompute it
+            self.counters['errors'] += 1
+            self._remove(path)
+            return default
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            self.counters['expirations'] += 1
+            self._remove(path)
+            return default
+        self.counters['hits'] += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump((time.time(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            self.counters['errors'] += 1  # read-only or full disk: the memory tier still works
+            self._remove(tmp)
+            return
+        self._evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _files(self):
+        """(mtime, size, path) of the cached files, oldest use first."""
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pkl'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def _evict(self):
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files[:-1]:  # never the value just written
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            self.counters['evictions'] += 1
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for _, _, path in self._files():
+                self._remove(path)
+
+    def stats(self):
+        files = self._files() if os.path.isdir(self.directory) else []
+        return {**self.counters, 'entries': len(files), 'bytes': sum(size for _, size, _ in files)}
+
+
+class TieredCache:
+    """An in-memory LRU in front of an on-disk cache.
+
+    A miss in memory falls through to disk (and is promoted back into memory);
+    a miss in both computes the value once, even when several sessions ask
+    for it at the same time, and stores it in both tiers.
+    """
+
+    def __init__(self, name, max_entries=64, max_bytes=None, ttl=None, disk=True, disk_bytes=DISK_CACHE_BYTES):
+        self.name = name
+        self.memory = LRUCache(max_entries, max_bytes, ttl)
+        self.disk = DiskCache(os.path.join(CACHE_DIR, name), disk_bytes, ttl) if disk and DISK_CACHE else None
+        self._computing = {}  # key -> lock held while the value is computed
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def get_or_compute(self, key, compute):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            key_lock = self._computing.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                with self.memory._lock:
+                    value = self.memory._lookup(key)  # computed by another thread meanwhile?
+                if value is _MISSING and self.disk is not None:
+                    value = self.disk.get(key, _MISSING)
+                    if value is not _MISSING:
+                        self.memory.put(key, value)
+                if value is _MISSING:
+                    value = compute()
+                    self.memory.put(key, value)
+                    if self.disk is not None:
+                        self.disk.put(key, value)
+            finally:
+                with self._lock:
+                    self._computing.pop(key, None)
+        return value
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        stats = {f'memory {name}': value for name, value in self.memory.stats().items()}
+        if self.disk is not None:
+            stats.update({f'disk {name}': value for name, value in self.disk.stats().items()})
+        return stats
+
+
+def cached(max_entries=2, max_bytes=None, ttl=None, disk=True, spinner=None):
+    """Memoize a function in a TieredCache named after it, keyed by its positional arguments.
+
+    The decorated loaders take the dataset fingerprint as an argument, so a new
+    dataset version is a new key and stale entries simply age out. Arguments
+    must have a stable repr and values must pickle. `spinner` is shown while
+    the value is computed in a Streamlit session.
+    """
+    def decorate(func):
+        cache = TieredCache(f'{func.__module__}.{func.__qualname__}', max_entries, max_bytes, ttl, disk)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            def compute():
+                if spinner and get_script_run_ctx() is not None:
+                    with st.spinner(spinner):
+                        return func(*args)
+                return func(*args)
+
+            return cache.get_or_compute(args, compute)
 
-# Caching an expensive computation function
-@st.cache_data  # Streamlit's caching decorator for caching data (works well for data-heavy computations)
-def expensive_computation(n):
-    """Simulate an expensive computation."""
-    time.sleep(2)  # Simulate a time-consuming task
-    result = n * n
-    return result
+        wrapper.cache = cache
+        return wrapper
+    return decorate
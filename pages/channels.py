@@ -0,0 +1,36 @@
+import streamlit as st
+
+from pages.charts import figure, plot
+from pages.context import section_data
+
+currency, filters, cube, shelf_life = section_data()
+
+st.markdown("""
+## 🏪 Online vs. Retail vs Wholesale – Where Do Dairy Sales Happen?  
+
+Not all sales channels perform the same! Some may be **growing faster**, while others could be **more profitable**.  
+- **Is retail still king?** 🏬  
+- **Does online sales contribute more than expected?** 💻  
+- **How important is wholesale?** 🚛  
+""")
+
+# Show in Streamlit
+plot(figure('sales_channel_revenue', filters, currency), use_container_width=True, key="sales_channel_revenue")
+
+# Create pie charts for each sales channel (top 3 farms by revenue)
+col1, col2, col3 = st.columns(3)
+
+# Pie chart for Online Sales
+with col1:
+    plot(figure('top_farm_channel_pie', filters, currency, 'Online'), use_container_width=True)
+
+# Pie chart for Retail Sales
+with col2:
+    plot(figure('top_farm_channel_pie', filters, currency, 'Retail'), use_container_width=True)
+
+# Pie chart for Wholesale Sales
+with col3:
+    plot(figure('top_farm_channel_pie', filters, currency, 'Wholesale'), use_container_width=True)
+
+# Show the chart in Streamlit
+plot(figure('channel_trend', filters, currency), use_container_width=True)
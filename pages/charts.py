@@ -0,0 +1,337 @@
+import calendar
+
+import plotly.express as px
+import streamlit as st
+
+from pages.caching import LRUCache
+from pages.cube import mean_of, rollup
+from pages.currency import SYMBOLS, revenue_column
+from pages.downsample import POINT_BUDGET, bin_scatter, downsample_lines
+from pages.efficiency import efficiency
+from pages.engines import query_engine
+from pages.profiling import mark_miss, stage
+from pages.timeseries import time_series
+
+# Built figures, shared by every session and rerun, keyed by
+# (chart id, chart args, dataset version, filter state, currency)
+_figures = LRUCache(max_entries=256, name='figures')
+
+# chart id -> builder(cube, shelf_life, currency, *args) returning a Plotly figure
+CHARTS = {}
+
+# Per-chart overrides of the point budget for downsampled lines and binned scatters
+POINT_BUDGETS = {'timeseries': 4 * POINT_BUDGET}
+
+
+def point_budget(chart_id):
+    """Most points the chart sends to the browser."""
+    return POINT_BUDGETS.get(chart_id, POINT_BUDGET)
+
+
+def chart(chart_id):
+    """Register a figure builder under a chart id."""
+    def register(builder):
+        CHARTS[chart_id] = builder
+        return builder
+    return register
+
+
+def figure(chart_id, filters, currency, *args):
+    """Return the figure for a chart, building it only on a cache miss."""
+    engine = query_engine()
+    key = (chart_id, args, engine.version(), filters, currency)
+
+    def build():
+        mark_miss()
+        cube, shelf_life = engine.cube(filters)
+        return CHARTS[chart_id](cube, shelf_life, currency, *args)
+
+    with stage('figure', chart_id):
+        return _figures.get_or_compute(key, build)
+
+
+def plot(fig, **kwargs):
+    """st.plotly_chart, timed as the rerun's 'send' stage along with the figure's payload size.
+
+    The serialized size is kept on the figure itself, so a cached figure is
+    only measured once and the size can never outlive (or move to) another one.
+    """
+    payload = getattr(fig, '_payload_bytes', None)
+    if payload is None:
+        payload = fig._payload_bytes = len(fig.to_json())
+    with stage('send', kwargs.get('key') or fig.layout.title.text or 'chart') as record:
+        record['payload_bytes'] = payload
+        return st.plotly_chart(fig, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Chart datasets (rollups of the cube, in the display currency)
+# ---------------------------------------------------------------------------
+
+def monthly_revenue(cube, currency):
+    # Roll the cube up to Year and Month to sum the revenue
+    data = rollup(cube, ['Year', 'Month'], [revenue_column(currency)])
+    # Convert month numbers to month names for better readability
+    data['Month'] = data['Month'].apply(lambda x: calendar.month_abbr[x])
+    return data
+
+
+def farm_stats(cube, currency):
+    # Group by farm location and calculate total revenue + average farm size
+    data = rollup(cube, 'Location', ['Total Land Area (acres)', revenue_column(currency), 'Rows'])
+    data['Total Land Area (acres)'] = mean_of(data, 'Total Land Area (acres)')  # Average farm size
+    return data
+
+
+def location_revenue(cube, currency):
+    # Group by Location to sum revenue
+    return rollup(cube, 'Location', [revenue_column(currency)])
+
+
+def channel_revenue(cube, currency):
+    # Aggregate Revenue by Sales Channel
+    return rollup(cube, 'Sales Channel', [revenue_column(currency)])
+
+
+def top_products(cube, currency, n=5):
+    # Aggregate Revenue by Product Name and keep the top sellers
+    revenue = revenue_column(currency)
+    data = rollup(cube, 'Product Name', [revenue])
+    return data.sort_values(by=revenue, ascending=False).head(n)
+
+
+def shelf_life_distribution(shelf_life):
+    # Rows per shelf-life value, from the precomputed shelf-life counts
+    return rollup(shelf_life, 'Shelf Life (days)', ['Rows'])
+
+
+def short_life_products(cube, currency, n=10):
+    # Identify products with the shortest shelf life
+    data = rollup(cube, ['Product Name', 'Brand'], ['Shelf Life (days)', revenue_column(currency)])
+    # Sort by lowest shelf life
+    return data.sort_values(by="Shelf Life (days)", ascending=True).head(n)
+
+
+def top_farm_channel_sales(cube, currency, n=3):
+    # Group by Location and Sales Channel, summing up the revenue
+    revenue = revenue_column(currency)
+    channel_sales = rollup(cube, ['Location', 'Sales Channel'], [revenue])
+    # Get top farms by total revenue
+    top_farms = location_revenue(cube, currency).sort_values(revenue, ascending=False).head(n)['Location']
+    return channel_sales[channel_sales['Location'].isin(top_farms)]
+
+
+def revenue_by_channel(cube, currency):
+    # Roll up by 'Year-Month' and 'Sales Channel' to calculate total revenue
+    return rollup(cube, ['Year-Month', 'Sales Channel'], [revenue_column(currency)])
+
+
+# Names of the chart dataset functions above that take (cube, currency)
+CHART_DATASETS = ['monthly_revenue', 'farm_stats', 'location_revenue', 'channel_revenue',
+                  'top_products', 'short_life_products', 'top_farm_channel_sales', 'revenue_by_channel']
+
+
+# ---------------------------------------------------------------------------
+# Figures
+# ---------------------------------------------------------------------------
+
+@chart('monthly_revenue')
+def monthly_revenue_chart(cube, shelf_life, currency):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    return px.line(monthly_revenue(cube, currency), x='Month', y=revenue, color='Year',
+                   title=f"📅 Monthly Revenue Trends Over the Years (in {currency})",
+                   labels={revenue: f'Total Revenue ({symbol})', 'Month': 'Month'},
+                   markers=True)
+
+
+@chart('farm_size_vs_revenue')
+def farm_size_vs_revenue_chart(cube, shelf_life, currency):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    fig = px.scatter(
+        bin_scatter(farm_stats(cube, currency), 'Total Land Area (acres)', revenue,
+                    point_budget('farm_size_vs_revenue')),
+        x='Total Land Area (acres)',
+        y=revenue,
+        title=f"📊 Farm Size vs. Revenue ({symbol})",
+        labels={'Total Land Area (acres)': 'Farm Size (acres)', revenue: f'Total Revenue ({symbol})'},
+        size=revenue,  # Bubble size based on revenue
+        color=revenue,  # Color by revenue
+        color_continuous_scale="magma",  # 🎨 High contrast color
+        hover_data=['Location']  # Show farm name on hover
+    )
+    # Improve readability
+    fig.update_layout(
+        plot_bgcolor="white",
+        font=dict(size=14)
+    )
+    return fig
+
+
+@chart('location_revenue')
+def location_revenue_chart(cube, shelf_life, currency):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    return px.bar(location_revenue(cube, currency), x='Location', y=revenue,
+                  title="📍 Revenue by Location", labels={revenue: f'Revenue ({symbol})'},
+                  color='Location')
+
+
+@chart('sales_channel_revenue')
+def sales_channel_revenue_chart(cube, shelf_life, currency):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    fig = px.bar(
+        channel_revenue(cube, currency),
+        x='Sales Channel',
+        y=revenue,
+        title="💰 Revenue by Sales Channel",
+        text_auto='.2s',
+        color=revenue,
+        color_continuous_scale="tealrose"
+    )
+    # Improve readability
+    fig.update_layout(
+        xaxis_title="Sales Channel",
+        yaxis_title=f"Total Revenue ({symbol})",
+        plot_bgcolor="white",
+        font=dict(size=14)
+    )
+    return fig
+
+
+@chart('product_revenue')
+def product_revenue_chart(cube, shelf_life, currency):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    fig = px.bar(
+        top_products(cube, currency),
+        x='Product Name',
+        y=revenue,
+        title="💰 Top 5 Best-Selling Dairy Products",
+        text_auto='.2s',
+        color=revenue,
+        color_continuous_scale="sunset"
+    )
+    # Improve readability
+    fig.update_layout(
+        xaxis_title="Product Name",
+        yaxis_title=f"Total Revenue ({symbol})",
+        plot_bgcolor="white",
+        font=dict(size=14)
+    )
+    return fig
+
+
+@chart('shelf_life')
+def shelf_life_chart(cube, shelf_life, currency):
+    # Histogram from the precomputed shelf-life counts
+    fig = px.histogram(shelf_life_distribution(shelf_life), x="Shelf Life (days)", y="Rows", histfunc="sum", nbins=30,
+                       title="📉 Shelf Life Distribution",
+                       labels={"Shelf Life (days)": "Shelf Life (in days)"},
+                       color_discrete_sequence=["#EF553B"])  # Using a strong red color for better contrast
+    fig.update_layout(yaxis_title="count")
+    return fig
+
+
+@chart('short_life_products')
+def short_life_products_chart(cube, shelf_life, currency):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    return px.bar(short_life_products(cube, currency), x='Product Name', y='Shelf Life (days)',
+                  color=revenue,
+                  title="🚨 Top 10 Fastest Expiring Products",
+                  labels={"Shelf Life (days)": "Shelf Life (in days)", "Product Name": "Product", revenue: f"Revenue ({symbol})"},
+                  color_continuous_scale="reds")  # Red scale to indicate risk
+
+
+@chart('top_farm_channel_pie')
+def top_farm_channel_pie_chart(cube, shelf_life, currency, channel):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    sales = top_farm_channel_sales(cube, currency)
+    return px.pie(
+        sales[sales['Sales Channel'] == channel],
+        names='Location',
+        values=revenue,
+        color='Location',
+        title=f"{channel} Sales Distribution",
+        labels={'Location': 'Farm', revenue: f'Revenue ({symbol})'},
+        hole=0.3  # Donut chart style
+    )
+
+
+@chart('channel_trend')
+def channel_trend_chart(cube, shelf_life, currency):
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    return px.line(
+        downsample_lines(revenue_by_channel(cube, currency), 'Year-Month', revenue, 'Sales Channel',
+                         point_budget('channel_trend')),
+        x='Year-Month',
+        y=revenue,  # Show revenue in the display currency
+        color='Sales Channel',  # Separate lines for each sales channel
+        title=f"📅 Online vs Retail vs Wholesale Sales Over Time (in {currency})",
+        labels={revenue: f'Total Revenue ({symbol})', 'Year-Month': 'Time (Year-Month)'},
+        markers=True  # Adding markers to make the lines more readable
+    )
+
+
+def timeseries_figure(filters, currency, granularity, metric, measure=None, by=None):
+    """Line chart of one time-series metric (None when no sales match), cached like the cube-backed figures.
+
+    The series filters dates to the day, so it can be empty for a selection
+    the month-grain cube still has rows for.
+    """
+    measure = measure or revenue_column(currency)
+    engine = query_engine()
+    key = ('timeseries', (granularity, metric, measure, by), engine.version(), filters, currency)
+
+    def build():
+        mark_miss()
+        data = time_series(filters, granularity, measure, by)
+        if data is None:
+            return None
+        if metric == 'Value' and by is None and granularity == 'Day':
+            # Raw daily totals are noisy: overlay the moving averages
+            lines = ['Value'] + [column for column in data.columns if column.endswith('-day MA')]
+            data = downsample_lines(data, 'Date', lines, budget=point_budget('timeseries'))
+            return px.line(data, x='Date', y=lines, title=f"📈 Daily {measure} with moving averages",
+                           labels={'value': measure, 'variable': ''})
+        data = downsample_lines(data, 'Date', metric, by, point_budget('timeseries'))
+        return px.line(data, x='Date', y=metric, color=by,
+                       title=f"📈 {measure} per {granularity.lower()} – {metric}",
+                       labels={metric: f'{measure} ({metric})' if metric != 'Value' else measure},
+                       markers=granularity != 'Day')
+
+    with stage('figure', 'timeseries'):
+        return _figures.get_or_compute(key, build)
+
+
+def revenue_per_cow_chart(table, currency):
+    """Revenue per cow against herd size, from a farm_efficiency() table."""
+    revenue, symbol = revenue_column(currency), SYMBOLS[currency]
+    data = bin_scatter(table, 'Number of Cows', 'Revenue per Cow', point_budget('revenue_per_cow'))
+    return px.scatter(
+        data,
+        x='Number of Cows',
+        y='Revenue per Cow',
+        title="🐄 Revenue Per Cow – Does More Cows Mean More Money?",
+        labels={'Number of Cows': 'Cows (average herd per year)',
+                'Revenue per Cow': f'Revenue per Cow per Year ({symbol})'},
+        size=revenue,  # Bubble size based on total revenue
+        color='Price Realization',  # Share of the list price actually realized
+        color_continuous_scale="viridis",
+        hover_data=['Location', 'Years Covered', 'Revenue per Acre'],
+    )
+
+
+def efficiency_figure(filters, currency):
+    """revenue_per_cow_chart() for the filter state (None when no sales match); cached like the others.
+
+    It is built from the farm tables rather than the cube, so it is not in
+    CHARTS: the batch export and the benchmark build it explicitly.
+    """
+    engine = query_engine()
+    key = ('revenue_per_cow', (), engine.version(), filters, currency)
+
+    def build():
+        mark_miss()
+        table = efficiency(filters, currency)
+        return None if table is None else revenue_per_cow_chart(table, currency)
+
+    with stage('figure', 'revenue_per_cow'):
+        return _figures.get_or_compute(key, build)
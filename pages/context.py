@@ -0,0 +1,41 @@
+import streamlit as st
+
+from pages.currency import sidebar_currency
+from pages.engines import query_engine
+from pages.filters import sidebar_filters
+from pages.profiling import stage
+from pages.warmup import sidebar_data_as_of
+
+
+def sidebar_selection():
+    """Render the shared sidebar (display currency + filters) and keep the picks in session state.
+
+    Called from the app.py entrypoint, so the selections persist while the
+    user switches between sections. It only reads the engine's small cached
+    filter domain; the data itself is loaded by the sections that need it.
+    """
+    st.session_state['currency'] = sidebar_currency()
+    st.session_state['filters'] = sidebar_filters(domain=query_engine().domain())
+    sidebar_data_as_of()
+
+
+def selection():
+    """(currency, filters) picked in the sidebar."""
+    return st.session_state['currency'], st.session_state['filters']
+
+
+def section_data():
+    """(currency, filters, cube, shelf_life) for the current selection.
+
+    Stops the section with a warning when no sales match the filters.
+    """
+    currency, filters = selection()
+    # Pre-aggregated sales cube for the current filters (cached per dataset version and filter state)
+    engine = query_engine()
+    with stage('aggregate', engine.name) as record:
+        cube, shelf_life = engine.cube(filters)
+        record['rows'] = len(cube)
+    if cube.empty:
+        st.warning("No sales match the selected filters.")
+        st.stop()
+    return currency, filters, cube, shelf_life
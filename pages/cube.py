@@ -0,0 +1,139 @@
+import pandas as pd
+
+from pages.caching import cached
+from pages.currency import CURRENCIES, price_column, revenue_column
+from pages.data import DATA_PATH, dataset_version, load_sales, month_categorical
+from pages.parallel import PARTITION_BY, WORKERS, map_partitions
+from pages.profiling import mark_miss
+
+# Finest grain every chart on the dashboard can be rolled up from
+CUBE_KEYS = ['Year', 'Month', 'Year-Month', 'Location', 'Sales Channel', 'Product Name', 'Brand']
+
+# Cube keys that are categoricals in the loaded frame
+CATEGORY_KEYS = ['Location', 'Sales Channel', 'Product Name', 'Brand']
+
+# Grain of the shelf-life side table: the filterable keys, Brand (so batch reports
+# can slice it per brand like the cube) and the shelf life itself
+SHELF_LIFE_KEYS = ['Year-Month', 'Location', 'Sales Channel', 'Product Name', 'Brand', 'Shelf Life (days)']
+
+# Cube measure -> (raw column, aggregation), all computed in one groupby pass.
+# 'Rows' is the number of sales rows behind a cell, so means are sum / Rows.
+CUBE_MEASURES = {
+    'Quantity Sold (liters/kg)': ('Quantity Sold (liters/kg)', 'sum'),
+    'Number of Cows': ('Number of Cows', 'sum'),
+    'Total Land Area (acres)': ('Total Land Area (acres)', 'sum'),
+    'Rows': ('Date', 'size'),
+    'Shelf Life (days)': ('Shelf Life (days)', 'min'),
+}
+
+# Revenue and unit-price measures in every display currency, so switching currency
+# is a column lookup rather than a re-aggregation
+for _currency in CURRENCIES:
+    _price = price_column(_currency)
+    CUBE_MEASURES[revenue_column(_currency)] = (revenue_column(_currency), 'sum')
+    CUBE_MEASURES[f'{_price} (sum)'] = (_price, 'sum')
+    CUBE_MEASURES[f'{_price} (min)'] = (_price, 'min')
+    CUBE_MEASURES[f'{_price} (max)'] = (_price, 'max')
+
+# How each cube measure is re-aggregated when rolling up or merging cubes
+MEASURES = {name: 'sum' if how == 'size' else how for name, (_, how) in CUBE_MEASURES.items()}
+
+# Raw columns the cube and the shelf-life table are built from
+SOURCE_COLUMNS = list(dict.fromkeys(CUBE_KEYS + SHELF_LIFE_KEYS + [c for c, _ in CUBE_MEASURES.values()]))
+
+
+def build_cube(df):
+    """Aggregate raw sales rows into the month x location x channel x product x brand cube."""
+    cube = df.groupby(CUBE_KEYS, observed=True, sort=False).agg(**CUBE_MEASURES)
+    return cube.reset_index()
+
+
+def rollup(cube, by, measures=None):
+    """Roll the cube up to the `by` keys, re-aggregating each measure correctly."""
+    measures = measures or list(MEASURES)
+    return cube.groupby(by, observed=True).agg({m: MEASURES[m] for m in measures}).reset_index()
+
+
+def mean_of(rolled, measure):
+    """Per-row mean of a summed measure in a rollup (e.g. average land area)."""
+    return rolled[measure] / rolled['Rows']
+
+
+def headline_kpis(cube, by=None, currency='INR'):
+    """Headline KPIs in one reduction over the cube, overall or split by `by` (e.g. 'Brand').
+
+    Returns a Series (or a frame with one row per group) with total revenue,
+    total quantity sold and the average, lowest and highest Price per Unit,
+    money amounts in `currency`.
+    """
+    revenue, price = revenue_column(currency), price_column(currency)
+    kpi_measures = [revenue, 'Quantity Sold (liters/kg)', 'Rows',
+                    f'{price} (sum)', f'{price} (min)', f'{price} (max)']
+    aggregations = {m: MEASURES[m] for m in kpi_measures}
+    if by is None:
+        totals = cube[kpi_measures].agg(aggregations)
+    else:
+        totals = cube.groupby(by, observed=True)[kpi_measures].agg(aggregations)
+    kpis = {
+        'Total Revenue': totals[revenue],
+        'Total Quantity Sold': totals['Quantity Sold (liters/kg)'],
+        'Avg. Price per Unit': totals[f'{price} (sum)'] / totals['Rows'],
+        'Min Price per Unit': totals[f'{price} (min)'],
+        'Max Price per Unit': totals[f'{price} (max)'],
+    }
+    return pd.Series(kpis) if by is None else pd.DataFrame(kpis).reset_index()
+
+
+def shelf_life_counts(df):
+    """Number of sales rows per shelf-life value, for the distribution histogram.
+
+    Kept at month x location x channel x product grain so the sidebar filters
+    can be applied to it just like to the cube.
+    """
+    counts = df.groupby(SHELF_LIFE_KEYS, observed=True, sort=False).size()
+    return counts.reset_index(name='Rows')
+
+
+def merge_cubes(cubes, keys=CUBE_KEYS):
+    """Combine partial cubes (e.g. from separate chunks) into one, exactly."""
+    merged = pd.concat(cubes, ignore_index=True)
+    measures = {m: a for m, a in MEASURES.items() if m in merged.columns and m not in keys}
+    merged = merged.groupby(keys, observed=True, sort=False).agg(measures).reset_index()
+    # Concatenating categoricals with different categories falls back to object
+    for key in keys:
+        if key in CATEGORY_KEYS:
+            merged[key] = merged[key].astype('category')
+        elif key == 'Year-Month':
+            merged[key] = month_categorical(merged[key].astype(str))
+    return merged
+
+
+def merge_shelf_life(counts):
+    """Combine partial shelf-life count tables into one."""
+    return merge_cubes(counts, keys=SHELF_LIFE_KEYS)
+
+
+def aggregate(df, workers=WORKERS, partition_by=PARTITION_BY):
+    """Return (cube, shelf_life_counts) for raw sales rows.
+
+    With workers > 1 the rows are partitioned (by `partition_by`, or into equal
+    row ranges), aggregated in a process pool over shared-memory columns and
+    the partial tables merged: counts and integer sums are exact, float sums
+    equal up to summation order, min / max unchanged.
+    """
+    if workers <= 1 or len(df) == 0:
+        return build_cube(df), shelf_life_counts(df)
+    cubes, counts = map_partitions(df, [build_cube, shelf_life_counts], partition_by, workers, SOURCE_COLUMNS)
+    return merge_cubes(cubes), merge_shelf_life(counts)
+
+
+@cached(spinner="Aggregating sales...")
+def _load_cube(path, version):
+    """Build the cube and side tables once per dataset version."""
+    mark_miss()
+    return aggregate(load_sales(path))
+
+
+def load_cube(path=DATA_PATH):
+    """Return (cube, shelf_life_counts) for the current dataset version."""
+    return _load_cube(path, dataset_version(path))
@@ -0,0 +1,72 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+# Local file of historical rates: one row per date, INR per one unit of each currency.
+# Rows may be daily or sparser; each sale uses the latest rate on or before its Date.
+RATES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'exchange_rates.csv')
+
+CURRENCIES = ['EUR', 'USD', 'GBP', 'INR']
+SYMBOLS = {'EUR': '€', 'USD': '$', 'GBP': '£', 'INR': '₹'}
+
+# Currencies that get their own converted columns (INR is the source currency)
+CONVERTED = [c for c in CURRENCIES if c != 'INR']
+
+
+def revenue_column(currency):
+    """Name of the revenue column (raw frame and cube) in the given currency."""
+    return 'Approx. Total Revenue(INR)' if currency == 'INR' else f'Revenue ({currency})'
+
+
+def price_column(currency):
+    """Name of the raw Price per Unit column in the given currency."""
+    return 'Price per Unit' if currency == 'INR' else f'Price per Unit ({currency})'
+
+
+@st.cache_data(show_spinner=False)
+def _load_rates(path, mtime_ns):
+    rates = pd.read_csv(path, parse_dates=['Date']).sort_values('Date', ignore_index=True)
+    return rates[['Date'] + CONVERTED]
+
+
+def rates_version(path=RATES_PATH):
+    """Changes whenever the rates file changes, so converted aggregates are rebuilt."""
+    return str(os.stat(path).st_mtime_ns)
+
+
+def load_rates(path=RATES_PATH):
+    """Exchange rates sorted by Date, reloaded whenever the rates file changes."""
+    return _load_rates(path, rates_version(path))
+
+
+def add_currency_columns(df, rates=None):
+    """Add revenue and unit-price columns in every supported currency.
+
+    The rate for each row is joined on Date with a single merge_asof over the
+    date-sorted rows (sales before the first rate use the earliest rate).
+    """
+    if rates is None:
+        rates = load_rates()
+    if not df['Date'].is_monotonic_increasing:
+        df = df.sort_values('Date', kind='stable', ignore_index=True)
+    if rates['Date'].dtype != df['Date'].dtype:
+        # e.g. a snapshot written with [ns] dates read next to rates parsed as [us]
+        rates = rates.astype({'Date': df['Date'].dtype})
+    joined = pd.merge_asof(df[['Date']], rates, on='Date', direction='backward')
+    joined = joined.fillna(rates.iloc[0][CONVERTED].to_dict())
+    revenue = df['Approx. Total Revenue(INR)'].to_numpy()
+    price = df['Price per Unit'].to_numpy()
+    for currency in CONVERTED:
+        per_inr = 1.0 / joined[currency].to_numpy()
+        df[revenue_column(currency)] = revenue * per_inr
+        df[price_column(currency)] = price * per_inr
+    return df
+
+
+def sidebar_currency():
+    """Render the display-currency picker and return the chosen currency code."""
+    return st.sidebar.selectbox(
+        "Display currency", CURRENCIES,
+        format_func=lambda c: f"{SYMBOLS[c]} {c}",
+    )
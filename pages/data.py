@@ -0,0 +1,270 @@
+import hashlib
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from pages.caching import cached
+from pages.currency import add_currency_columns, rates_version
+from pages.profiling import mark_miss, stage
+
+logger = logging.getLogger(__name__)
+
+# Location of the bundled dataset (resolved relative to the project root)
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'dairy_dataset.csv')
+
+# Low-cardinality text columns, stored as categoricals
+CATEGORICAL_COLUMNS = [
+    'Location',
+    'Farm Size',
+    'Product Name',
+    'Brand',
+    'Storage Condition',
+    'Customer Location',
+    'Sales Channel',
+]
+
+# Columns parsed as datetime64 at load time
+DATE_COLUMNS = ['Date', 'Production Date', 'Expiration Date']
+
+# Explicit dtypes so pandas never has to guess. Integers are downcast to the
+# narrowest width that fits the data's range, as nullable dtypes so a blank value
+# is <NA> rather than a failed load; money and the floats any table sums stay
+# float64 so aggregates are unchanged, the rest (never aggregated) are float32.
+DTYPES = {
+    'Location': 'category',
+    'Total Land Area (acres)': 'float64',
+    'Number of Cows': 'Int16',
+    'Farm Size': 'category',
+    'Product ID': 'Int16',
+    'Product Name': 'category',
+    'Brand': 'category',
+    'Quantity (liters/kg)': 'float32',
+    'Price per Unit': 'float64',
+    'Total Value': 'float32',
+    'Shelf Life (days)': 'Int16',
+    'Storage Condition': 'category',
+    'Quantity Sold (liters/kg)': 'Int32',
+    'Price per Unit (sold)': 'float64',
+    'Approx. Total Revenue(INR)': 'float64',
+    'Customer Location': 'category',
+    'Sales Channel': 'category',
+    'Quantity in Stock (liters/kg)': 'Int32',
+    'Minimum Stock Threshold (liters/kg)': 'float32',
+    'Reorder Quantity (liters/kg)': 'float32',
+}
+
+# What pandas itself parses: the text columns straight to categoricals. Numbers
+# and dates are checked and cast afterwards by coerce_schema().
+PARSE_DTYPES = {column: dtype for column, dtype in DTYPES.items() if dtype == 'category'}
+
+# Keys of the snapshot's Parquet metadata written by write_snapshot()
+SNAPSHOT_METADATA = [b'source_version', b'untyped_bytes']
+
+
+@st.cache_data(show_spinner=False)
+def _file_hash(path, mtime_ns, size):
+    """Content hash of the dataset, recomputed only when mtime or size change."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_version(path=DATA_PATH):
+    """Return a fingerprint that changes whenever the dataset file changes."""
+    stat = os.stat(path)
+    return _file_hash(path, stat.st_mtime_ns, stat.st_size)
+
+
+def dataset_version(path=DATA_PATH):
+    """Fingerprint of everything the loaded frame depends on: the file and the exchange rates."""
+    return f"{file_version(path)}-{rates_version()}"
+
+
+def month_categorical(labels):
+    """'YYYY-MM' labels as an ordered categorical, so they sort and compare chronologically."""
+    return pd.Categorical(labels, categories=sorted(pd.unique(labels)), ordered=True)
+
+
+def add_calendar_columns(df):
+    """Add the Year, Month and Year-Month columns used by the charts.
+
+    Year-Month is an ordered categorical: one small code per row, and a
+    'YYYY-MM' label per month rather than per row.
+    """
+    df['Year'] = df['Date'].dt.year.astype('int16')
+    df['Month'] = df['Date'].dt.month.astype('int8')
+    codes, months = pd.factorize(df['Date'].dt.to_period('M'), sort=True)
+    df['Year-Month'] = pd.Categorical.from_codes(codes, categories=months.astype(str), ordered=True)
+    return df
+
+
+def add_derived_columns(df):
+    """Calendar keys plus revenue and unit price in every display currency."""
+    return add_currency_columns(add_calendar_columns(df))
+
+
+def coerce_schema(df, source='sales data'):
+    """Cast freshly parsed columns to the schema, turning bad values into missing ones.
+
+    As with errors='coerce', a blank, non-numeric or out-of-range number becomes
+    <NA> / NaN and an unparseable date NaT instead of failing the whole load.
+    Rows without a sales Date are dropped, since no chart can place them. The
+    bad values are counted per column in a warning.
+    """
+    bad = {}
+    for column, dtype in DTYPES.items():
+        if dtype == 'category':
+            if not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+            continue
+        values = df[column]
+        parsed = values if pd.api.types.is_numeric_dtype(values) else pd.to_numeric(values, errors='coerce')
+        if dtype.startswith('Int'):
+            limits = np.iinfo(dtype.lower())
+            parsed = parsed.where((parsed % 1 == 0) & parsed.between(limits.min, limits.max))
+        bad[column] = int((parsed.isna() & values.notna()).sum())
+        df[column] = parsed.astype(dtype)
+    for column in DATE_COLUMNS:
+        if not pd.api.types.is_datetime64_dtype(df[column]):
+            parsed = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce')
+            bad[column] = int((parsed.isna() & df[column].notna()).sum())
+            df[column] = parsed
+    undated = df['Date'].isna().to_numpy()
+    if undated.any():
+        df = df[~undated].reset_index(drop=True)
+    bad = {column: count for column, count in bad.items() if count}
+    if bad or undated.any():
+        logger.warning("%s: coerced unparseable values to missing (%s); dropped %d rows without a Date",
+                       source, ', '.join(f'{column}: {count}' for column, count in bad.items()) or 'none',
+                       undated.sum())
+    return df
+
+
+def enforce_schema(df):
+    """Cast the source columns to the schema (a no-op for frames read with it)."""
+    casts = {column: dtype for column, dtype in DTYPES.items() if df[column].dtype != dtype}
+    if casts:
+        df = df.astype(casts)
+    for column in DATE_COLUMNS:
+        if not pd.api.types.is_datetime64_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], format='%Y-%m-%d')
+    return df
+
+
+def frame_bytes(df):
+    """Bytes held by every column of the frame, measured deeply."""
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+
+def read_csv_measured(path=DATA_PATH):
+    """(typed frame, bytes of the untyped frame): the CSV as a plain pd.read_csv holds it, then cast.
+
+    The untyped size is the baseline the schema's saving is reported against;
+    parsing as text first measures it rather than modelling it.
+    """
+    df = pd.read_csv(path)
+    untyped = frame_bytes(df)
+    return coerce_schema(df, os.path.basename(path)), untyped
+
+
+def read_csv_typed(path=DATA_PATH):
+    """Parse the CSV into the explicit schema (the slow, text-based path)."""
+    return read_csv_measured(path)[0]
+
+
+def snapshot_path(path=DATA_PATH):
+    """Location of the columnar snapshot written next to the CSV."""
+    return os.path.splitext(path)[0] + '.parquet'
+
+
+def snapshot_metadata(path=DATA_PATH):
+    """The snapshot's own metadata (source version, untyped size), or {} when there is none."""
+    snapshot = snapshot_path(path)
+    if not os.path.exists(snapshot):
+        return {}
+    metadata = pq.read_schema(snapshot).metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items() if key in SNAPSHOT_METADATA}
+
+
+def snapshot_is_fresh(path=DATA_PATH, version=None):
+    """True when the snapshot exists and was built from the current CSV."""
+    return snapshot_metadata(path).get('source_version') == (version or file_version(path))
+
+
+def write_snapshot(path=DATA_PATH, df=None, version=None, untyped=None):
+    """Write the typed frame as Parquet, tagged with the CSV version it came from.
+
+    Categorical columns are stored dictionary-encoded and the date columns as
+    datetime64, so reading it back needs no parsing at all. The untyped frame's
+    size is stamped too, so loads from the snapshot can still report it.
+    """
+    if df is None:
+        df, untyped = read_csv_measured(path)
+    snapshot = snapshot_path(path)
+    tmp = snapshot + '.tmp'
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Stamp the source version (and untyped size) into the schema metadata
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'source_version'] = (version or file_version(path)).encode()
+    if untyped is not None:
+        metadata[b'untyped_bytes'] = str(untyped).encode()
+    pq.write_table(table.replace_schema_metadata(metadata), tmp)
+    os.replace(tmp, snapshot)
+    return snapshot
+
+
+def read_snapshot(path=DATA_PATH):
+    """Memory-map the Parquet snapshot into a frame with the loader's dtypes."""
+    return enforce_schema(pd.read_parquet(snapshot_path(path), memory_map=True))
+
+
+# Memory only: the Parquet snapshot already persists the frame, and memory-maps back
+# faster than a pickle of it would load, without a second copy per code version
+@cached(disk=False, spinner="Loading sales data...")
+def _load_sales(path, version):
+    """Load once per dataset version, preferring the columnar snapshot."""
+    mark_miss()
+    source = file_version(path)
+    metadata = snapshot_metadata(path)
+    if metadata.get('source_version') == source and 'untyped_bytes' in metadata:
+        df = read_snapshot(path)
+        untyped = int(metadata['untyped_bytes'])
+    else:
+        # Snapshot missing, stale or without the untyped size: fall back to the CSV and rebuild it
+        df, untyped = read_csv_measured(path)
+        try:
+            write_snapshot(path, df, source, untyped)
+        except OSError:
+            pass  # read-only deployments keep working off the CSV
+    typed = frame_bytes(df)
+    with stage('transform', 'derived columns', rows=len(df)):
+        mark_miss()  # it only runs inside the loader's own miss
+        df = add_derived_columns(df)
+    # Before: the plain pd.read_csv frame; after: everything the worker keeps, derived columns included
+    loaded = frame_bytes(df)
+    logger.info("Loaded %s: %d rows, %.2f MB untyped -> %.2f MB typed (%.1fx smaller), "
+                "%.2f MB with derived columns (%.1fx smaller)", os.path.basename(path), len(df),
+                untyped / 2**20, typed / 2**20, untyped / typed, loaded / 2**20, untyped / loaded)
+    return df
+
+
+def load_sales(path=DATA_PATH):
+    """Load the dairy sales dataset, cached process-wide per dataset version."""
+    with stage('load', os.path.basename(path)) as record:
+        df = _load_sales(path, dataset_version(path))
+        record['rows'] = len(df)
+    return df
+
+
+if __name__ == '__main__':
+    # Conversion step: python -m pages.data [path/to/file.csv]
+    source = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    print(f"Wrote {write_snapshot(source)}")
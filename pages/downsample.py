@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Most points a chart sends to the browser, across all its traces (per-chart overrides live in charts.py)
+POINT_BUDGET = int(os.environ.get('SALES_POINT_BUDGET', 2000))
+
+
+def _axis(values):
+    """Numeric positions for an x column: numbers as-is, dates as nanoseconds, labels by position."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy().astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def lttb(x, y, n_out):
+    """Indices of the `n_out` points Largest-Triangle-Three-Buckets keeps from a sorted series.
+
+    The first and last points are always kept; from each bucket in between
+    the point forming the largest triangle with the previously kept point and
+    the next bucket's average is kept, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    y = np.nan_to_num(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def downsample_lines(data, x, y, color=None, budget=POINT_BUDGET):
+    """Reduce a long-form line-chart frame to about `budget` points.
+
+    The budget is split evenly across the traces (one per `color` value) and
+    the y columns; each trace keeps the LTTB points of every y column.
+    """
+    if len(data) <= budget:
+        return data
+    ys = [y] if isinstance(y, str) else list(y)
+    traces = [data] if color is None else [trace for _, trace in data.groupby(color, observed=True, sort=False)]
+    per_series = max(budget // (len(traces) * len(ys)), 3)
+    parts = []
+    for trace in traces:
+        trace = trace.sort_values(x, kind='stable')
+        xs = _axis(trace[x])
+        keep = np.unique(np.concatenate([lttb(xs, trace[column].to_numpy(dtype=np.float64), per_series)
+                                         for column in ys]))
+        parts.append(trace.iloc[keep])
+    return pd.concat(parts, ignore_index=True)
+
+
+def _bins(values, side):
+    lo, hi = np.nanmin(values), np.nanmax(values)
+    if hi <= lo:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.clip(((values - lo) / (hi - lo) * side).astype(np.int64), 0, side - 1)
+
+
+def bin_scatter(data, x, y, budget=POINT_BUDGET):
+    """Replace a scatter's points by at most `budget` grid-cell centroids.
+
+    The x / y plane is cut into a square grid; each occupied cell becomes one
+    point at the mean of its numeric columns, with a 'Points' count. Text
+    columns keep their value for single-point cells and read "N points"
+    otherwise.
+    """
+    if len(data) <= budget:
+        return data
+    side = max(int(np.sqrt(budget)), 1)
+    cell = _bins(_axis(data[x]), side) * side + _bins(data[y].to_numpy(dtype=np.float64), side)
+    grouped = data.groupby(cell, sort=False)
+    numeric = data.select_dtypes('number').columns
+    text = data.columns.difference(numeric, sort=False)
+    binned = grouped[list(numeric)].mean()
+    points = grouped.size()
+    for column in text:
+        first = grouped[column].first().astype(str)
+        binned[column] = first.where(points == 1, points.astype(str) + ' points')
+    binned['Points'] = points
+    return binned.reset_index(drop=True)[list(data.columns) + ['Points']]
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+from pages.caching import LRUCache, cached
+from pages.currency import CURRENCIES, revenue_column
+from pages.data import DATA_PATH, dataset_version, load_sales
+from pages.engines import TableSpec, query_engine
+from pages.filters import Filters
+from pages.streaming import STREAM_SOURCE
+
+# Herd size and land are repeated on every sales row (each row with its own values),
+# so they are reduced to one mean per location and year before being summed
+FARM_KEYS = ['Location', 'Year']
+FARM_ATTRIBUTES = ['Total Land Area (acres)', 'Number of Cows']
+
+# Farm table measures: the attributes' sums and the number of records, so partial
+# tables merge exactly and the means are sum / Records
+FARM_MEASURES = [f'{attribute} (sum)' for attribute in FARM_ATTRIBUTES] + ['Records']
+
+# Grain of the sales table: the day (so date filters apply exactly), the farm keys,
+# the filterable columns and Brand
+SALES_KEYS = ['Date', 'Year', 'Location', 'Sales Channel', 'Product Name', 'Brand']
+
+# Quantity sold valued at the realized and at the list Price per Unit (INR; the ratio is currency-free)
+SOLD_VALUE = 'Sold Value (INR)'
+LIST_VALUE = 'List Value (INR)'
+
+SALES_MEASURES = ([revenue_column(currency) for currency in CURRENCIES]
+                  + ['Quantity Sold (liters/kg)', SOLD_VALUE, LIST_VALUE])
+
+# Efficiency tables, memoized per (engine, data version, filter state, currency) across sessions
+_efficiency = LRUCache(max_entries=128, name='farm efficiency')
+
+
+def farm_table(df):
+    """One row per location and year: summed herd size and land, and the records behind them."""
+    return df.groupby(FARM_KEYS, observed=True, sort=False).agg(
+        **{f'{attribute} (sum)': (attribute, 'sum') for attribute in FARM_ATTRIBUTES},
+        Records=('Date', 'size'),
+    ).reset_index()
+
+
+def sales_table(df):
+    """Revenue, quantity and list vs realized sales value per day x location x channel x product x brand."""
+    sold = df['Quantity Sold (liters/kg)'].to_numpy(dtype=np.float64)
+    rows = df[SALES_KEYS].copy()
+    for measure in SALES_MEASURES[:-2]:
+        rows[measure] = df[measure].to_numpy()
+    rows[SOLD_VALUE] = sold * df['Price per Unit (sold)'].to_numpy(dtype=np.float64)
+    rows[LIST_VALUE] = sold * df['Price per Unit'].to_numpy(dtype=np.float64)
+    return rows.groupby(SALES_KEYS, observed=True, sort=False)[SALES_MEASURES].sum().reset_index()
+
+
+def merge_tables(farms, sales):
+    """Combine partial (farms, sales) tables, e.g. from separate chunks, exactly."""
+    farms = pd.concat(farms, ignore_index=True)
+    farms = farms.groupby(FARM_KEYS, observed=True, sort=False)[FARM_MEASURES].sum().reset_index()
+    sales = pd.concat(sales, ignore_index=True)
+    sales = sales.groupby(SALES_KEYS, observed=True, sort=False)[SALES_MEASURES].sum().reset_index()
+    # Concatenating categoricals with different categories falls back to object
+    farms['Location'] = farms['Location'].astype('category')
+    for key in SALES_KEYS[2:]:
+        sales[key] = sales[key].astype('category')
+    return farms, sales
+
+
+def year_fractions(years, start, end):
+    """Share of each calendar year in `years` that the days from `start` to `end` (inclusive) cover."""
+    begins = pd.DatetimeIndex(pd.to_datetime(pd.Series(years).astype(str), format='%Y'))
+    ends = begins + pd.offsets.YearEnd()
+    covered = (ends.where(ends < end, end) - begins.where(begins > start, start)).days + 1
+    return np.clip(covered.to_numpy(dtype=np.float64), 0, None) / ((ends - begins).days + 1).to_numpy()
+
+
+def farm_efficiency(farms, sales, currency, span=None):
+    """Per-location yields from the farm and sales tables, joined on location and year.
+
+    Each location-year counts its mean herd and land once, however many sales
+    rows repeat them, weighted by the share of that year the (first day, last
+    day) `span` covers (default: the sales' own dates). Revenue per Cow / per
+    Acre are thus annualized, per cow-year / acre-year, also for a date
+    filter covering days or months; Years Covered sums those shares, and
+    Number of Cows and Total Land Area are averages over them. Price
+    Realization is the sold value over the same quantities at list price.
+    """
+    if farms.duplicated(FARM_KEYS).any():
+        # Summing repeated rows would scale the herds with the number of sales rows again
+        raise ValueError("farm table must have one row per location and year (see farm_table)")
+    revenue = revenue_column(currency)
+    start, end = span or (sales['Date'].min(), sales['Date'].max())
+    farms = farms.set_index(FARM_KEYS)
+    herd = pd.DataFrame({attribute: farms[f'{attribute} (sum)'] / farms['Records'] for attribute in FARM_ATTRIBUTES})
+    earned = sales.groupby(FARM_KEYS, observed=True)[[revenue, 'Quantity Sold (liters/kg)', SOLD_VALUE, LIST_VALUE]].sum()
+    yearly = earned.join(herd, how='inner')
+    # Herd and land in cow-years / acre-years over the covered part of each year
+    yearly['Years Covered'] = year_fractions(yearly.index.get_level_values('Year'), start, end)
+    yearly[FARM_ATTRIBUTES] = yearly[FARM_ATTRIBUTES].mul(yearly['Years Covered'], axis=0)
+    totals = yearly.groupby(level='Location', observed=True).sum()
+
+    out = pd.DataFrame({
+        'Years Covered': totals['Years Covered'],
+        'Number of Cows': totals['Number of Cows'] / totals['Years Covered'],
+        'Total Land Area (acres)': totals['Total Land Area (acres)'] / totals['Years Covered'],
+        revenue: totals[revenue],
+        'Quantity Sold (liters/kg)': totals['Quantity Sold (liters/kg)'],
+        'Revenue per Cow': totals[revenue] / totals['Number of Cows'],
+        'Revenue per Acre': totals[revenue] / totals['Total Land Area (acres)'],
+        'Price Realization': totals[SOLD_VALUE] / totals[LIST_VALUE],
+    })
+    return out.replace([np.inf, -np.inf], np.nan).reset_index().sort_values('Revenue per Cow', ascending=False,
+                                                                            ignore_index=True)
+
+
+@cached(spinner="Summarizing farms...")
+def _load_efficiency_tables(path, version):
+    """Build the farm and sales tables once per dataset version."""
+    df = load_sales(path)
+    return farm_table(df), sales_table(df)
+
+
+def efficiency_tables(path=DATA_PATH):
+    """(farms, sales) tables of whatever feeds the dashboard."""
+    if STREAM_SOURCE:
+        from pages.tables import load_stream_tables  # it imports this module
+        tables = load_stream_tables()
+        return None if tables is None else (tables.farms, tables.sales)
+    return _load_efficiency_tables(path, dataset_version(path))
+
+
+def load_farms():
+    """The farm table of whatever feeds the dashboard."""
+    tables = efficiency_tables()
+    return None if tables is None else tables[0]
+
+
+def load_farm_sales():
+    """The sales table of whatever feeds the dashboard."""
+    tables = efficiency_tables()
+    return None if tables is None else tables[1]
+
+
+# farm_table() and sales_table() for engines that push the groupby down to the raw rows
+FARM_TABLE = TableSpec('farms', FARM_KEYS, {
+    **{f'{attribute} (sum)': f'SUM("{attribute}")' for attribute in FARM_ATTRIBUTES},
+    'Records': 'COUNT(*)',
+}, load_farms, filtered=False)
+FARM_SALES_TABLE = TableSpec('farm sales', SALES_KEYS, {
+    **{measure: f'SUM("{measure}")' for measure in SALES_MEASURES[:-2]},
+    SOLD_VALUE: 'SUM("Quantity Sold (liters/kg)" * "Price per Unit (sold)")',
+    LIST_VALUE: 'SUM("Quantity Sold (liters/kg)" * "Price per Unit")',
+}, load_farm_sales)
+
+
+def efficiency(filters, currency):
+    """farm_efficiency() for the filter state (None when no sales match), memoized in a bounded LRU.
+
+    The filters apply to the sales only, at day grain; the farm table is read
+    whole and the join keeps the location-years that still have sales. The
+    yields are annualized over the selected dates, within the data's own.
+    """
+    engine = query_engine()
+
+    def compute():
+        farms = engine.table(FARM_TABLE, Filters())
+        sales = engine.table(FARM_SALES_TABLE, filters)
+        if farms is None or sales is None or sales.empty:
+            return None
+        _, first, last = engine.domain()
+        span = (first if filters.start is None else max(filters.start, first),
+                last if filters.end is None else min(filters.end, last))
+        return farm_efficiency(farms, sales, currency, span)
+
+    return _efficiency.get_or_compute((engine.name, engine.version(), filters, currency), compute)
@@ -0,0 +1,293 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, NamedTuple
+
+import pandas as pd
+import streamlit as st
+
+from pages.caching import LRUCache
+from pages.cube import CATEGORY_KEYS, CUBE_KEYS, CUBE_MEASURES, SHELF_LIFE_KEYS, SOURCE_COLUMNS
+from pages.data import DATA_PATH, month_categorical
+from pages.filters import FILTER_COLUMNS, Filters, _filter_domain, data_version, filter_daily, filtered_cube
+from pages.profiling import mark_miss
+from pages.streaming import STREAM_SOURCE, iter_chunks, source_version
+
+# Set SALES_QUERY_ENGINE=sqlite to answer the dashboard's aggregations with SQL
+# against an embedded database file instead of pandas in the Streamlit worker
+QUERY_ENGINE = os.environ.get('SALES_QUERY_ENGINE', 'pandas')
+
+# Columns the database needs: the filter columns, the cube keys, the measures' raw
+# columns and those the sections' own tables (TableSpec) aggregate
+TABLE_COLUMNS = list(dict.fromkeys(['Date'] + SOURCE_COLUMNS + [
+    'Expiration Date', 'Quantity in Stock (liters/kg)', 'Minimum Stock Threshold (liters/kg)',
+    'Reorder Quantity (liters/kg)', 'Price per Unit (sold)',
+]))
+
+# Columns stored as ISO date text (which compares correctly) and parsed back on the way out
+TEXT_DATE_COLUMNS = ['Date', 'Expiration Date']
+
+# Columns the sidebar filters on, each backed by an index
+INDEXED_COLUMNS = ['Date', 'Location', 'Sales Channel']
+
+_SQL_AGGREGATES = {'sum': 'SUM', 'min': 'MIN', 'max': 'MAX'}
+
+# Query results, memoized per (engine, source version, filter state or 'domain') across sessions
+_engine_cubes = LRUCache(max_entries=128, max_bytes=512 * 2**20, name='engine queries')
+
+_build_lock = threading.Lock()
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def database_path(source=DATA_PATH):
+    """SQLite file built next to the source: data/dairy_dataset.sqlite for the bundled CSV."""
+    return os.path.splitext(source.rstrip(os.sep))[0] + '.sqlite'
+
+
+def database_is_fresh(db_path, version):
+    """True if the database exists and was built from this source version."""
+    if not os.path.exists(db_path):
+        return False
+    try:
+        with sqlite3.connect(f'file:{db_path}?mode=ro', uri=True) as con:
+            meta = dict(con.execute('SELECT key, value FROM meta').fetchall())
+    except sqlite3.Error:
+        return False
+    # A database built with fewer columns (an older version of the code) is rebuilt too
+    return meta.get('source_version') == version and meta.get('columns') == json.dumps(TABLE_COLUMNS)
+
+
+def build_database(source=DATA_PATH, db_path=None, version=None):
+    """Load the source CSV(s) chunk by chunk into an indexed SQLite table.
+
+    The file is written under a temporary name and swapped in, so readers
+    never see a half-built database.
+    """
+    db_path = db_path or database_path(source)
+    tmp = f'{db_path}.tmp'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = sqlite3.connect(tmp)
+    try:
+        con.execute('PRAGMA journal_mode = OFF')
+        con.execute('PRAGMA synchronous = OFF')
+        for chunk in iter_chunks(source):
+            chunk = chunk[TABLE_COLUMNS]
+            for column in TEXT_DATE_COLUMNS:
+                chunk[column] = chunk[column].dt.strftime('%Y-%m-%d')
+            chunk.to_sql('sales', con, if_exists='append', index=False)
+        for column in INDEXED_COLUMNS:
+            con.execute(f"CREATE INDEX {_quote('idx_' + column.replace(' ', '_'))} ON sales ({_quote(column)})")
+        con.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+        con.execute("INSERT INTO meta VALUES ('source_version', ?)", (version or source_version(source),))
+        con.execute("INSERT INTO meta VALUES ('columns', ?)", (json.dumps(TABLE_COLUMNS),))
+        con.execute('ANALYZE')
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, db_path)
+    return db_path
+
+
+def _where(filters):
+    """WHERE clause and parameters for a filter state."""
+    clauses, params = [], []
+    if filters.start is not None:
+        clauses.append('"Date" >= ?')
+        params.append(filters.start.strftime('%Y-%m-%d'))
+    if filters.end is not None:
+        clauses.append('"Date" <= ?')
+        params.append(filters.end.strftime('%Y-%m-%d'))
+    for column, selected in filters.selections():
+        if selected:
+            clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(selected))})")
+            params.extend(selected)
+    return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+
+def _select(con, keys, expressions, filters):
+    """Run one GROUP BY of SQL aggregate `expressions` (name -> SQL) over the filtered rows."""
+    select = [_quote(key) for key in keys] + [f'{sql} AS {_quote(name)}' for name, sql in expressions.items()]
+    where, params = _where(filters)
+    sql = (f"SELECT {', '.join(select)} FROM sales{where} "
+           f"GROUP BY {', '.join(_quote(key) for key in keys)}")
+    table = pd.read_sql_query(sql, con, params=params)
+    for key in keys:
+        if key in CATEGORY_KEYS:
+            table[key] = table[key].astype('category')
+        elif key == 'Year-Month':
+            table[key] = month_categorical(table[key])
+        elif key in TEXT_DATE_COLUMNS:
+            table[key] = pd.to_datetime(table[key], format='%Y-%m-%d')
+    return table
+
+
+def _group_by(con, keys, measures, filters):
+    """Run one GROUP BY over the filtered rows and return it as a frame like build_cube's."""
+    expressions = {
+        name: 'COUNT(*)' if how == 'size' else f'{_SQL_AGGREGATES[how]}({_quote(column)})'
+        for name, (column, how) in measures.items()
+    }
+    return _select(con, keys, expressions, filters)
+
+
+def query_cube(db_path, filters):
+    """Return (cube, shelf_life_counts) for the filter state, aggregated inside SQLite."""
+    with sqlite3.connect(f'file:{db_path}?mode=ro', uri=True) as con:
+        cube = _group_by(con, CUBE_KEYS, CUBE_MEASURES, filters)
+        shelf_life = _group_by(con, SHELF_LIFE_KEYS, {'Rows': ('Date', 'size')}, filters)
+    return cube, shelf_life
+
+
+def query_table(db_path, spec, filters):
+    """A TableSpec's table for the filter state, aggregated inside SQLite."""
+    with sqlite3.connect(f'file:{db_path}?mode=ro', uri=True) as con:
+        return _select(con, spec.keys, spec.sql, filters)
+
+
+def query_domain(db_path):
+    """Options for each categorical filter plus the first and last sales date."""
+    with sqlite3.connect(f'file:{db_path}?mode=ro', uri=True) as con:
+        options = {
+            column: [value for (value,) in con.execute(
+                f'SELECT DISTINCT {_quote(column)} FROM sales ORDER BY 1')]
+            for column in FILTER_COLUMNS
+        }
+        first, last = con.execute('SELECT MIN("Date"), MAX("Date") FROM sales').fetchone()
+    return options, pd.Timestamp(first), pd.Timestamp(last)
+
+
+@st.cache_resource(show_spinner="Building the sales database...", max_entries=2)
+def _database(source, version):
+    """Path of an up-to-date database for this source version, (re)built at most once."""
+    db_path = database_path(source)
+    with _build_lock:
+        if not database_is_fresh(db_path, version):
+            build_database(source, db_path, version)
+    return db_path
+
+
+class TableSpec(NamedTuple):
+    """A table a section reads besides the cube, e.g. the daily stock table.
+
+    `keys` and `sql` (measure -> SQL aggregate over the raw sales columns)
+    let an engine push the groupby down; `load()` builds the whole table in
+    pandas (from the loaded frame, or incrementally in streaming mode).
+    A table that is not `filtered` (e.g. one without a Date key) is always
+    read whole, whatever filter state it is asked for.
+    """
+    name: str
+    keys: list
+    sql: dict
+    load: Callable
+    filtered: bool = True
+
+
+class QueryEngine(ABC):
+    """Answers the dashboard's aggregations for a filter state.
+
+    Every engine returns the same (cube, shelf_life_counts) tables, so the
+    chart rollups and figures do not depend on which one is in use. An engine
+    missing any of the abstract methods cannot be instantiated.
+    """
+
+    name = None
+
+    def __init__(self, source=None):
+        self.source = source or STREAM_SOURCE or DATA_PATH
+
+    @abstractmethod
+    def version(self):
+        """Fingerprint of the data behind the engine's answers."""
+
+    @abstractmethod
+    def domain(self):
+        """(options per filter column, first date, last date) for the sidebar."""
+
+    @abstractmethod
+    def cube(self, filters):
+        """(cube, shelf_life_counts) for the filter state."""
+
+    @abstractmethod
+    def table(self, spec, filters):
+        """The TableSpec's table for the filter state (None when there is no data at all).
+
+        Implementations read a spec that is not `filtered` with Filters().
+        """
+
+
+class PandasEngine(QueryEngine):
+    """The in-process pandas path: cached cube plus the SalesIndex for filtered views."""
+
+    name = 'pandas'
+
+    def version(self):
+        return data_version()
+
+    def domain(self):
+        return _filter_domain(DATA_PATH)
+
+    def cube(self, filters):
+        return filtered_cube(filters)
+
+    def table(self, spec, filters):
+        table = spec.load()
+        if table is None or not spec.filtered:
+            return table
+        return filter_daily(table, filters)
+
+
+class SQLiteEngine(QueryEngine):
+    """Pushes the groupbys down as SQL to an embedded SQLite file built from the source.
+
+    The worker only ever holds aggregated rows, so it scales past what fits in
+    a pandas frame; the indexes on the filter columns keep narrow filters cheap.
+    """
+
+    name = 'sqlite'
+
+    def version(self):
+        return source_version(self.source)
+
+    def database(self):
+        return _database(self.source, self.version())
+
+    def domain(self):
+        db_path = self.database()
+        return _engine_cubes.get_or_compute((self.name, self.version(), 'domain'), lambda: query_domain(db_path))
+
+    def cube(self, filters):
+        db_path = self.database()
+
+        def compute():
+            mark_miss()
+            return query_cube(db_path, filters)
+
+        return _engine_cubes.get_or_compute((self.name, self.version(), filters), compute)
+
+    def table(self, spec, filters):
+        db_path = self.database()
+        if not spec.filtered:
+            filters = Filters()
+
+        def compute():
+            mark_miss()
+            return query_table(db_path, spec, filters)
+
+        return _engine_cubes.get_or_compute((self.name, self.version(), spec.name, filters), compute)
+
+
+ENGINES = {engine.name: engine for engine in (PandasEngine, SQLiteEngine)}
+
+
+def query_engine(name=None):
+    """The engine selected by SALES_QUERY_ENGINE (or by name)."""
+    name = name or QUERY_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"Unknown query engine {name!r}; expected one of {', '.join(ENGINES)}")
+    return ENGINES[name]()
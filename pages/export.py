@@ -0,0 +1,188 @@
+"""Headless batch export of every dashboard KPI, chart dataset and figure.
+
+Run from the project root:
+
+    python -m pages.export --output reports/2026-10-18                     # whole dataset, EUR
+    python -m pages.export --output reports/nightly --by Location Brand --currencies EUR INR --format parquet
+
+The sales are scanned and aggregated into the cube once; every report (the
+whole dataset plus one per value of each --by column) is a slice of that same
+cube, so many filter combinations cost one scan. Reports are written
+concurrently, each to <output>/<slice>/<currency>/:
+
+    kpis.csv / kpis_by_product.csv     headline KPIs, overall and per product
+    inventory_kpis.csv                 at-risk inventory KPIs
+    datasets/<name>.csv                every chart dataset, the farm efficiency and at-risk
+                                       inventory tables, and each granularity's time-series
+                                       rollup and revenue / quantity metrics (or .parquet)
+    figures/<chart>.html               every figure (or Plotly .json, or none)
+
+plus a manifest.json at the top listing every file written.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pages import charts
+from pages.cube import CATEGORY_KEYS, headline_kpis
+from pages.currency import CURRENCIES, revenue_column
+from pages.data import DATA_PATH, load_sales
+from pages.efficiency import farm_efficiency
+from pages.inventory import inventory_kpis, inventory_status
+from pages.streaming import iter_chunks
+from pages.tables import Aggregates
+from pages.timeseries import GRANULARITIES, SERIES_KEYS, build_rollups, series_metrics
+
+# Columns a report can be sliced by: keys of the cube and of every table sliced with it
+SLICE_COLUMNS = CATEGORY_KEYS
+
+# Time-series metrics written per granularity: file label -> measure (None: revenue in the report's currency)
+SERIES_MEASURES = {'revenue': None, 'quantity': 'Quantity Sold (liters/kg)'}
+
+
+def _slug(value):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(value)).strip('-') or 'blank'
+
+
+def report_slices(tables, by=()):
+    """Yield (slice name, Aggregates): the whole dataset, then one slice per value of each `by` column.
+
+    The farm table is never sliced: its join with the sliced sales keeps the
+    farms that matter.
+    """
+    yield 'all', tables
+    for column in by:
+        for value in sorted(tables.cube[column].unique()):
+            yield (f'{_slug(column)}={_slug(value)}', tables._replace(**{
+                name: table[table[column] == value] for name, table in tables._asdict().items() if name != 'farms'
+            }))
+
+
+def _write_table(table, path, fmt):
+    path = f'{path}.{fmt}'
+    if fmt == 'parquet':
+        table.to_parquet(path, index=False)
+    else:
+        table.to_csv(path, index=False)
+    return path
+
+
+def write_report(directory, tables, currency, fmt='csv', figures='html'):
+    """Write one report (KPIs, chart datasets, figures) for a slice; returns the files written."""
+    cube, shelf_life, farms, sales, stock, series = tables
+    written = []
+    os.makedirs(os.path.join(directory, 'datasets'), exist_ok=True)
+
+    kpis = headline_kpis(cube, currency=currency).to_frame('Value').rename_axis('KPI').reset_index()
+    written.append(_write_table(kpis, os.path.join(directory, 'kpis'), fmt))
+    by_product = headline_kpis(cube, by='Product Name', currency=currency)
+    written.append(_write_table(by_product, os.path.join(directory, 'kpis_by_product'), fmt))
+
+    datasets = {name: getattr(charts, name)(cube, currency) for name in charts.CHART_DATASETS}
+    datasets['shelf_life_distribution'] = charts.shelf_life_distribution(shelf_life)
+    datasets['farm_efficiency'] = farm_efficiency(farms, sales, currency)
+    if not stock.empty:
+        status = inventory_status(stock)
+        inventory = inventory_kpis(status).to_frame('Value').rename_axis('KPI').reset_index()
+        written.append(_write_table(inventory, os.path.join(directory, 'inventory_kpis'), fmt))
+        datasets['at_risk_inventory'] = status
+    if not series.empty:
+        levels = build_rollups(series)
+        measures = {label: measure or revenue_column(currency) for label, measure in SERIES_MEASURES.items()}
+        for granularity, freq in GRANULARITIES.items():
+            label = granularity.lower()
+            datasets[f'rollup_{label}'] = levels[freq][['Date'] + SERIES_KEYS + list(measures.values())]
+            for name, measure in measures.items():
+                datasets[f'series_{label}_{name}'] = series_metrics(levels[freq], freq, measure)
+    for name, table in datasets.items():
+        written.append(_write_table(table, os.path.join(directory, 'datasets', name), fmt))
+
+    if figures == 'none':
+        return written
+    os.makedirs(os.path.join(directory, 'figures'), exist_ok=True)
+    built = {}
+    for chart_id, builder in charts.CHARTS.items():
+        if chart_id == 'top_farm_channel_pie':
+            variants = [(f'{chart_id}_{_slug(channel)}', (channel,)) for channel in cube['Sales Channel'].unique()]
+        else:
+            variants = [(chart_id, ())]
+        for name, args in variants:
+            built[name] = builder(cube, shelf_life, currency, *args)
+    # Built from the farm tables rather than the cube, so not in CHARTS
+    built['revenue_per_cow'] = charts.revenue_per_cow_chart(datasets['farm_efficiency'], currency)
+    for name, fig in built.items():
+        path = os.path.join(directory, 'figures', f'{name}.{figures}')
+        if figures == 'html':
+            fig.write_html(path, include_plotlyjs='cdn')
+        else:
+            with open(path, 'w') as f:
+                f.write(fig.to_json())
+        written.append(path)
+    return written
+
+
+def load_aggregates(source=DATA_PATH, stream=False):
+    """Aggregates from one pass over the source, with the dashboard's own code."""
+    if not stream:
+        return Aggregates.of(load_sales(source))
+    tables = None
+    for chunk in iter_chunks(source):
+        part = Aggregates.of(chunk)
+        tables = part if tables is None else tables.merge(part)
+    return tables
+
+
+def export(output, source=DATA_PATH, by=(), currencies=('EUR',), fmt='csv', figures='html', stream=False,
+           workers=None):
+    """Aggregate once, then write every (slice, currency) report concurrently. Returns the manifest."""
+    start = time.perf_counter()
+    tables = load_aggregates(source, stream)
+    scanned = time.perf_counter() - start
+
+    slices = list(report_slices(tables, by))
+    jobs = [(os.path.join(output, name, currency), part, currency)
+            for name, part in slices
+            for currency in currencies]
+    with ThreadPoolExecutor(workers) as pool:
+        futures = [pool.submit(write_report, directory, part, currency, fmt, figures)
+                   for directory, part, currency in jobs]
+        files = [path for future in futures for path in future.result()]
+
+    manifest = {
+        'source': os.path.abspath(source),
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'slices': [name for name, _ in slices],
+        'currencies': list(currencies),
+        'scan_seconds': scanned,
+        'total_seconds': time.perf_counter() - start,
+        'files': [os.path.relpath(path, output) for path in files],
+    }
+    with open(os.path.join(output, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', required=True, help="directory the reports are written to")
+    parser.add_argument('--source', default=DATA_PATH, help="sales CSV (or, with --stream, a directory of CSVs)")
+    parser.add_argument('--stream', action='store_true', help="aggregate chunk by chunk instead of loading the frame")
+    parser.add_argument('--by', nargs='*', default=[], choices=SLICE_COLUMNS,
+                        help="also write one report per value of each of these columns")
+    parser.add_argument('--currencies', nargs='*', default=['EUR'], choices=CURRENCIES)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--figures', choices=['html', 'json', 'none'], default='html')
+    parser.add_argument('--workers', type=int, default=None, help="concurrent report writers")
+    args = parser.parse_args()
+
+    manifest = export(args.output, args.source, args.by, args.currencies, args.format, args.figures,
+                      args.stream, args.workers)
+    print(f"Wrote {len(manifest['files'])} files for {len(manifest['slices'])} slices to {args.output} "
+          f"in {manifest['total_seconds']:.1f} s (scan {manifest['scan_seconds']:.1f} s)")
+
+
+if __name__ == '__main__':
+    main()
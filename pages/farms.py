@@ -0,0 +1,66 @@
+import streamlit as st
+
+from pages.charts import efficiency_figure, figure, plot
+from pages.context import section_data
+from pages.currency import SYMBOLS, revenue_column
+from pages.efficiency import efficiency
+
+currency, filters, cube, shelf_life = section_data()
+
+st.markdown("""
+## 📊 Farm Size vs. Revenue – Does a Bigger Farm Mean More Money?
+
+One of the key questions in dairy farm operations is whether **larger farms generate more revenue**, or if smaller farms can be just as profitable.
+
+This analysis compares **Total Land Area (acres)** with **Total Revenue** using a **scatter plot**. Each dot represents a farm:
+
+- **Larger dots** indicate farms with **higher revenue**.
+- The **trendline** will help determine if **farm size impacts profitability**.
+""")
+
+# Scatter plot for farm size vs revenue
+plot(figure('farm_size_vs_revenue', filters, currency), use_container_width=True, key="farm_size_vs_revenue")
+# 🏷️ Revenue by Location
+st.markdown("## 📍 Revenue by Location")
+
+# Bar chart for revenue by location
+plot(figure('location_revenue', filters, currency), use_container_width=True)
+st.markdown("""
+Chandigarh, Delhi, and Bihar stand out as the largest consumer markets for our dairy products, consistently driving significant revenue.  
+
+These regions show high demand due to dense populations, strong dairy consumption habits, and well-established distribution channels.  
+
+Urban areas like Chandigarh and Delhi contribute through retail and supermarket sales, while Bihar reflects strong demand in both urban and rural sectors.  
+""")
+
+# 🐄 Revenue Per Cow – Does More Cows Mean More Money?
+st.markdown("""
+## 🐄 Revenue Per Cow – Does More Cows Mean More Money?
+
+Does having **more cows** automatically mean **higher revenue**, or do some farms generate more revenue with **fewer cows**?  
+
+Every sales row repeats a herd size and land area, so each location counts its **average herd once per year** before comparing:  
+- **Bigger dots** = Locations generating **more revenue**  
+- **Color** = **Price realization**, the share of the list price actually obtained on the quantities sold  
+""")
+
+# The farm tables filter dates to the day, so they can be empty for a selection the cube still has rows for
+farm_yields = efficiency(filters, currency)
+if farm_yields is None:
+    st.info("No sales on the selected days: widen the date range to compare farms.")
+    st.stop()
+
+# Scatter plot for revenue per cow, from the per location-year farm table
+plot(efficiency_figure(filters, currency), use_container_width=True, key="revenue_per_cow_1")
+
+# 🌾 Yields per cow and per acre
+st.markdown("## 🌾 Farm Efficiency by Location")
+st.markdown("Revenue per cow and per acre are **annualized**: a date range covering part of a year counts only that "
+            "part of the herd's and land's year. Cows and land are **averages** over the years covered.")
+SYMBOL = SYMBOLS[currency]
+farm_yields = farm_yields.rename(columns={
+    revenue_column(currency): f'Total Revenue ({SYMBOL})',
+    'Revenue per Cow': f'Revenue per Cow ({SYMBOL})',
+    'Revenue per Acre': f'Revenue per Acre ({SYMBOL})',
+})
+st.dataframe(farm_yields.round(2), hide_index=True)
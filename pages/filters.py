@@ -0,0 +1,191 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from pages.caching import LRUCache, cached
+from pages.cube import build_cube, load_cube, shelf_life_counts
+from pages.data import DATA_PATH, dataset_version, load_sales
+from pages.profiling import mark_miss
+from pages.streaming import STREAM_SOURCE, load_stream_cube, source_version
+
+# Categorical columns that get a sidebar multiselect
+FILTER_COLUMNS = ['Location', 'Sales Channel', 'Product Name']
+
+# Filtered cubes, memoized per (dataset version, filter state) across sessions
+_filtered_cubes = LRUCache(max_entries=128, max_bytes=512 * 2**20, name='filtered cubes')
+
+
+class Filters(NamedTuple):
+    """Hashable filter state. None / empty tuples mean "no restriction"."""
+    start: pd.Timestamp = None
+    end: pd.Timestamp = None
+    locations: tuple = ()
+    channels: tuple = ()
+    products: tuple = ()
+
+    def is_empty(self):
+        return self == Filters()
+
+    def selections(self):
+        """(column, selected values) pairs for the categorical filters."""
+        return zip(FILTER_COLUMNS, (self.locations, self.channels, self.products))
+
+
+class SalesIndex:
+    """Sales rows sorted by Date plus one precomputed boolean mask per category value.
+
+    A filter is answered with a binary search on Date for the range and a few
+    ORs / ANDs of the precomputed masks, never a fresh scan of the whole frame.
+    """
+
+    def __init__(self, df):
+        self.df = df.sort_values('Date', kind='stable').reset_index(drop=True)
+        self.dates = self.df['Date'].to_numpy()
+        self.masks = {
+            column: {value: (self.df[column] == value).to_numpy() for value in self.df[column].cat.categories}
+            for column in FILTER_COLUMNS
+        }
+
+    def options(self, column):
+        return list(self.masks[column])
+
+    def date_bounds(self):
+        return pd.Timestamp(self.dates[0]), pd.Timestamp(self.dates[-1])
+
+    def rows(self, filters):
+        """Return the sales rows matching the filter state."""
+        lo = 0 if filters.start is None else np.searchsorted(self.dates, np.datetime64(filters.start), 'left')
+        hi = len(self.dates) if filters.end is None else np.searchsorted(self.dates, np.datetime64(filters.end), 'right')
+        keep = np.ones(hi - lo, dtype=bool)
+        for column, selected in filters.selections():
+            if selected:
+                keep &= np.logical_or.reduce([self.masks[column][value][lo:hi] for value in selected])
+        return self.df.iloc[lo:hi][keep]
+
+
+def filter_tables(filters, *tables):
+    """Apply the filter state to already-aggregated tables.
+
+    Used in streaming mode, where no raw rows are kept: the date range can only
+    be honoured at the month grain of the 'Year-Month' key.
+    """
+    filtered = []
+    for table in tables:
+        keep = np.ones(len(table), dtype=bool)
+        # As labels: an ordered categorical only compares to months among its categories
+        months = table['Year-Month'].astype(str)
+        if filters.start is not None:
+            keep &= (months >= filters.start.strftime('%Y-%m')).to_numpy()
+        if filters.end is not None:
+            keep &= (months <= filters.end.strftime('%Y-%m')).to_numpy()
+        for column, selected in filters.selections():
+            if selected:
+                keep &= table[column].isin(selected).to_numpy()
+        filtered.append(table[keep])
+    return tuple(filtered)
+
+
+def filter_daily(table, filters):
+    """Apply the filter state to a table at day grain (with a 'Date' column and the filter columns)."""
+    keep = np.ones(len(table), dtype=bool)
+    if filters.start is not None:
+        keep &= (table['Date'] >= filters.start).to_numpy()
+    if filters.end is not None:
+        keep &= (table['Date'] <= filters.end).to_numpy()
+    for column, selected in filters.selections():
+        if selected:
+            keep &= table[column].isin(selected).to_numpy()
+    return table[keep]
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _sales_index(path, version):
+    """Built once per dataset version and shared (read-only) by all sessions."""
+    return SalesIndex(load_sales(path))
+
+
+def data_version(path=DATA_PATH):
+    """Version of whatever feeds the dashboard: the streamed source or the bundled dataset."""
+    return source_version(STREAM_SOURCE) if STREAM_SOURCE else dataset_version(path)
+
+
+def filtered_cube(filters, path=DATA_PATH):
+    """Return (cube, shelf_life_counts) for the filter state, memoized in a bounded LRU."""
+    version = data_version(path)
+    if STREAM_SOURCE:
+        if filters.is_empty():
+            return load_stream_cube()
+
+        def compute():
+            mark_miss()
+            return filter_tables(filters, *load_stream_cube())
+    else:
+        if filters.is_empty():
+            return load_cube(path)
+
+        def compute():
+            mark_miss()
+            rows = _sales_index(path, version).rows(filters)
+            return build_cube(rows), shelf_life_counts(rows)
+
+    return _filtered_cubes.get_or_compute((version, filters), compute)
+
+
+@cached()
+def _load_domain(path, version):
+    """Filter options and date bounds, kept once per dataset version.
+
+    A few hundred bytes: later reruns, sessions and (through the disk tier)
+    server restarts render the sidebar without loading the frame or
+    building the SalesIndex.
+    """
+    df = load_sales(path)
+    options = {column: list(df[column].cat.categories) for column in FILTER_COLUMNS}
+    return options, df['Date'].min(), df['Date'].max()
+
+
+def _filter_domain(path):
+    """Options for each categorical filter plus the first and last sales date."""
+    if STREAM_SOURCE:
+        cube, _ = load_stream_cube()
+        months = pd.PeriodIndex(cube['Year-Month'], freq='M')
+        options = {column: sorted(cube[column].unique()) for column in FILTER_COLUMNS}
+        return options, months.min().start_time, months.max().end_time.normalize()
+    return _load_domain(path, dataset_version(path))
+
+
+def sidebar_filters(path=DATA_PATH, domain=None):
+    """Render the sidebar filter widgets and return the selected Filters.
+
+    `domain` is an (options, first date, last date) triple from a query engine;
+    by default it is read from the pandas index.
+    """
+    options, first, last = domain or _filter_domain(path)
+
+    st.sidebar.markdown("## 🔎 Filters")
+    if STREAM_SOURCE:
+        st.sidebar.caption("Streaming mode: the date range applies to whole months.")
+    picked = st.sidebar.date_input(
+        "Date range", value=(first.date(), last.date()),
+        min_value=first.date(), max_value=last.date(),
+    )
+    # While the user is still picking, date_input returns only the first date
+    if isinstance(picked, tuple):
+        picked = picked or (first.date(),)
+        start, end = pd.Timestamp(picked[0]), pd.Timestamp(picked[-1])
+    else:
+        start = end = pd.Timestamp(picked)
+
+    locations = st.sidebar.multiselect("Location", options['Location'], placeholder="All locations")
+    channels = st.sidebar.multiselect("Sales Channel", options['Sales Channel'], placeholder="All channels")
+    products = st.sidebar.multiselect("Product Name", options['Product Name'], placeholder="All products")
+
+    return Filters(
+        start=None if start <= first else start,
+        end=None if end >= last else end,
+        locations=tuple(sorted(locations)),
+        channels=tuple(sorted(channels)),
+        products=tuple(sorted(products)),
+    )
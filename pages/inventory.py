@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from pages.caching import LRUCache, cached
+from pages.data import DATA_PATH, dataset_version, load_sales
+from pages.engines import TableSpec, query_engine
+from pages.streaming import STREAM_SOURCE
+
+# Grain of the at-risk inventory table
+INVENTORY_KEYS = ['Product Name', 'Brand', 'Location']
+
+# Grain of the daily table it is computed from (the channel keeps the sidebar filters applicable)
+DAILY_KEYS = ['Date'] + INVENTORY_KEYS + ['Sales Channel']
+
+SOLD = 'Quantity Sold (liters/kg)'
+STOCK = 'Quantity in Stock (liters/kg)'
+THRESHOLD = 'Minimum Stock Threshold (liters/kg)'
+REORDER = 'Reorder Quantity (liters/kg)'
+
+# Daily measures, all sums, so daily tables built from separate chunks merge exactly
+DAILY_MEASURES = [SOLD, STOCK, THRESHOLD, REORDER, 'Records', 'Records Below Threshold',
+                  'Expired Stock (liters/kg)', 'Expiring Stock (liters/kg)']
+
+# Days of sales the velocity is averaged over
+VELOCITY_DAYS = 90
+
+# Restocking lead time: less cover than this is a high stock-out risk, less than twice it medium
+LEAD_TIME_DAYS = 7
+
+# Stock whose Expiration Date is at most this many days after its record Date counts as expiring
+EXPIRY_HORIZON_DAYS = 3
+
+# At-risk tables, memoized per (data version, filter state) across sessions
+_statuses = LRUCache(max_entries=64, name='inventory status')
+
+
+def daily_stock(df):
+    """Reduce stock records to one row per day x product x brand x location x channel.
+
+    Besides the summed stock columns it counts the records below their minimum
+    threshold and splits off the stock already expired, or expiring within
+    EXPIRY_HORIZON_DAYS, at the record's Date.
+    """
+    days_left = (df['Expiration Date'] - df['Date']).dt.days.to_numpy()
+    stock = df[STOCK].to_numpy(dtype=np.int64, na_value=0)
+    rows = df[DAILY_KEYS].copy()
+    rows[SOLD] = df[SOLD].to_numpy(dtype=np.int64, na_value=0)
+    rows[STOCK] = stock
+    rows[THRESHOLD] = df[THRESHOLD].to_numpy(dtype=np.float64)
+    rows[REORDER] = df[REORDER].to_numpy(dtype=np.float64)
+    rows['Records'] = 1
+    rows['Records Below Threshold'] = (stock < rows[THRESHOLD].to_numpy()).astype(np.int64)
+    rows['Expired Stock (liters/kg)'] = np.where(days_left <= 0, stock, 0)
+    rows['Expiring Stock (liters/kg)'] = np.where((days_left > 0) & (days_left <= EXPIRY_HORIZON_DAYS), stock, 0)
+    return rows.groupby(DAILY_KEYS, observed=True, sort=False)[DAILY_MEASURES].sum().reset_index()
+
+
+def merge_daily(tables):
+    """Combine partial daily tables (e.g. from separate chunks) into one, exactly."""
+    merged = pd.concat(tables, ignore_index=True)
+    merged = merged.groupby(DAILY_KEYS, observed=True, sort=False)[DAILY_MEASURES].sum().reset_index()
+    # Concatenating categoricals with different categories falls back to object
+    for key in DAILY_KEYS[1:]:
+        merged[key] = merged[key].astype('category')
+    return merged
+
+
+def inventory_status(daily, window=VELOCITY_DAYS):
+    """Stock-out and expiry risk per product x brand x location, as of the table's last day.
+
+    - Stock / Threshold / Reorder: the item's records on its latest day.
+    - Daily Velocity: units sold per day over the trailing `window` days.
+    - Days of Cover: stock / velocity (infinite when nothing sold).
+    - Stock-out Risk: High below threshold or under LEAD_TIME_DAYS of cover,
+      Medium under twice that, Low otherwise.
+    - Expiry Risk: share of the window's stock expired or about to expire.
+    """
+    as_of = daily['Date'].max()
+    last_day = daily.groupby(INVENTORY_KEYS, observed=True)['Date'].transform('max')
+    current = daily[daily['Date'] == last_day].groupby(INVENTORY_KEYS, observed=True).agg(
+        **{'Last Record': ('Date', 'max'), STOCK: (STOCK, 'sum'), THRESHOLD: (THRESHOLD, 'sum'),
+           REORDER: (REORDER, 'sum')},
+    )
+    recent = daily[daily['Date'] > as_of - pd.Timedelta(days=window)]
+    totals = recent.groupby(INVENTORY_KEYS, observed=True)[
+        [SOLD, STOCK, 'Records', 'Records Below Threshold', 'Expired Stock (liters/kg)', 'Expiring Stock (liters/kg)']
+    ].sum()
+    status = current.join(totals, rsuffix=' (window)').fillna(0)
+
+    stock = status[STOCK].to_numpy(dtype=np.float64)
+    velocity = status[SOLD].to_numpy(dtype=np.float64) / window
+    cover = np.divide(stock, velocity, out=np.full(len(status), np.inf), where=velocity > 0)
+    below = stock < status[THRESHOLD].to_numpy()
+    at_risk = (status['Expired Stock (liters/kg)'] + status['Expiring Stock (liters/kg)']).to_numpy(dtype=np.float64)
+    window_stock = status[f'{STOCK} (window)'].to_numpy(dtype=np.float64)
+
+    status['Daily Velocity'] = velocity
+    status['Days of Cover'] = cover
+    status['Below Threshold'] = below
+    status['Stock-out Risk'] = pd.Categorical(
+        np.select([below | (cover < LEAD_TIME_DAYS), cover < 2 * LEAD_TIME_DAYS], ['High', 'Medium'], 'Low'),
+        categories=['High', 'Medium', 'Low'], ordered=True,
+    )
+    status['Expiry Risk'] = np.divide(at_risk, window_stock, out=np.zeros(len(status)), where=window_stock > 0)
+    status = status.drop(columns=[f'{STOCK} (window)']).rename(columns={SOLD: f'{SOLD} (window)'})
+    return status.reset_index().sort_values(['Stock-out Risk', 'Days of Cover'], ignore_index=True)
+
+
+def inventory_kpis(status):
+    """Headline figures of an inventory_status() table."""
+    return pd.Series({
+        'High Stock-out Risk': int((status['Stock-out Risk'] == 'High').sum()),
+        'Below Minimum Threshold': int(status['Below Threshold'].sum()),
+        'Avg. Expiry Risk': status['Expiry Risk'].mean(),
+    })
+
+
+@cached(spinner="Summarizing stock records...")
+def _load_daily(path, version):
+    """Build the daily table once per dataset version."""
+    return daily_stock(load_sales(path))
+
+
+def load_daily(path=DATA_PATH):
+    """The daily stock table of whatever feeds the dashboard."""
+    if STREAM_SOURCE:
+        from pages.tables import load_stream_tables  # it imports this module
+        tables = load_stream_tables()
+        return None if tables is None else tables.stock
+    return _load_daily(path, dataset_version(path))
+
+
+def _days_left(condition):
+    """SQL sum of the stock on records whose days to expiry meet `condition`."""
+    return f'SUM(CASE WHEN julianday("Expiration Date") - julianday("Date") {condition} THEN "{STOCK}" ELSE 0 END)'
+
+
+# daily_stock() for engines that push the groupby down to the raw rows
+DAILY_TABLE = TableSpec('daily stock', DAILY_KEYS, {
+    SOLD: f'SUM("{SOLD}")',
+    STOCK: f'SUM("{STOCK}")',
+    THRESHOLD: f'SUM("{THRESHOLD}")',
+    REORDER: f'SUM("{REORDER}")',
+    'Records': 'COUNT(*)',
+    'Records Below Threshold': f'SUM("{STOCK}" < "{THRESHOLD}")',
+    'Expired Stock (liters/kg)': _days_left('<= 0'),
+    'Expiring Stock (liters/kg)': _days_left(f'BETWEEN 1 AND {EXPIRY_HORIZON_DAYS}'),
+}, load_daily)
+
+
+def at_risk_inventory(filters):
+    """inventory_status() for the filter state, from the query engine, memoized in a bounded LRU."""
+    engine = query_engine()
+
+    def compute():
+        daily = engine.table(DAILY_TABLE, filters)
+        return None if daily is None or daily.empty else inventory_status(daily)
+
+    return _statuses.get_or_compute((engine.name, engine.version(), filters), compute)
@@ -0,0 +1,150 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Cores this process may run on
+CORES = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+# Worker processes for the aggregation pipeline; 1 (the default) keeps everything
+# in-process. The pool stays off by default: no multi-core speedup has been measured
+# yet, and on one core it was 2-3x slower than serial. Run
+# benchmarks/parallel_benchmark.py on the target host before raising it. Capped at
+# the core count, since an oversubscribed pool only adds overhead.
+WORKERS = min(int(os.environ.get('SALES_WORKERS', 1)), CORES)
+
+# Column the rows are partitioned on ('Year', 'Location', ...); unset splits into equal row ranges
+PARTITION_BY = os.environ.get('SALES_PARTITION_BY') or None
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(workers):
+    """A long-lived pool per worker count, so process start-up is paid once."""
+    with _pools_lock:
+        if workers not in _pools:
+            # spawn, not fork: the Streamlit server is multi-threaded
+            _pools[workers] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pools[workers]
+
+
+@atexit.register
+def _shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown(cancel_futures=True)
+
+
+def _share(df, columns, order):
+    """Copy `columns` of the frame (reordered by `order`, if given) into one shared-memory block.
+
+    Each column is written straight from the frame into the block, gathered by
+    `order` on the way, so neither a column subset nor a reordered copy is
+    built first. Returns the block and its layout: (column, kind, dtype,
+    offset, categories) per column. Categoricals and strings travel as
+    integer codes plus their (small) categories, and nullable integers as
+    their values followed by their missing-value mask, so workers rebuild the
+    frame without copying it.
+    """
+    arrays, layout, offset = [], [], 0
+    for column in columns:
+        series = df[column]
+        mask = None
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            kind, values, categories = 'category', series.cat.codes.to_numpy(), list(series.cat.categories)
+        elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            codes, uniques = pd.factorize(series)
+            kind, values, categories = 'string', codes, list(uniques)
+        elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            kind, categories = 'nullable', None
+            values = series.to_numpy(series.dtype.numpy_dtype, na_value=0)
+            mask = series.isna().to_numpy()
+        else:
+            kind, values, categories = 'values', series.to_numpy(), None
+        layout.append((column, kind, values.dtype.str, offset, categories))
+        for array in (values, mask):
+            if array is not None:
+                arrays.append((offset, array))
+                offset += array.nbytes
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for start, values in arrays:
+        target = np.frombuffer(block.buf, values.dtype, len(values), start)
+        if order is None:
+            target[:] = values
+        else:
+            np.take(values, order, out=target)
+    return block, layout
+
+
+def _attach(buf, layout, rows, start, stop):
+    """Rebuild rows [start, stop) of the shared frame as views over the block."""
+    columns = {}
+    for column, kind, dtype, offset, categories in layout:
+        values = np.frombuffer(buf, np.dtype(dtype), rows, offset)[start:stop]
+        if kind == 'category':
+            columns[column] = pd.Categorical.from_codes(values, categories=categories)
+        elif kind == 'nullable':
+            mask = np.frombuffer(buf, np.bool_, rows, offset + rows * values.itemsize)[start:stop]
+            columns[column] = pd.arrays.IntegerArray(values, mask)
+        elif kind == 'string':
+            # code -1 (missing) picks the trailing None
+            columns[column] = np.asarray(categories + [None], dtype=object)[values]
+        else:
+            columns[column] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _run_partition(name, layout, rows, start, stop, funcs):
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        frame = _attach(block.buf, layout, rows, start, stop)
+        results = [func(frame) for func in funcs]
+        del frame
+        return results
+    finally:
+        block.close()
+
+
+def partition_bounds(df, by=PARTITION_BY, parts=WORKERS):
+    """Row order (None: unchanged) and [start, stop) ranges.
+
+    One range per value of `by`, or `parts` equal row ranges when `by` is None.
+    """
+    if by is None:
+        edges = np.linspace(0, len(df), parts + 1).astype(np.int64)
+        return None, list(zip(edges[:-1], edges[1:]))
+    codes, _ = pd.factorize(df[by])
+    order = np.argsort(codes, kind='stable')
+    starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+    stops = np.r_[starts[1:], len(df)]
+    return order, list(zip(starts, stops))
+
+
+def map_partitions(df, funcs, by=PARTITION_BY, workers=WORKERS, columns=None):
+    """Apply each of `funcs` to every partition of `df` in a process pool.
+
+    Only `columns` (default: all) are shared with the workers. `funcs` must be
+    module-level functions (they are pickled by name). Returns one list of
+    partial results per function, for the caller to merge.
+    """
+    order, bounds = partition_bounds(df, by, workers)
+    block, layout = _share(df, list(df.columns) if columns is None else columns, order)
+    try:
+        futures = [_pool(workers).submit(_run_partition, block.name, layout, len(df), start, stop, funcs)
+                   for start, stop in bounds if stop > start]
+        partials = [future.result() for future in futures]
+    except BrokenProcessPool:
+        # A dead worker breaks the whole pool; start a fresh one next time
+        with _pools_lock:
+            _pools.pop(workers, None)
+        raise
+    finally:
+        block.close()
+        block.unlink()
+    return [list(results) for results in zip(*partials)]
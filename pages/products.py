@@ -0,0 +1,38 @@
+import streamlit as st
+
+from pages.charts import figure, plot
+from pages.context import section_data
+
+currency, filters, cube, shelf_life = section_data()
+
+st.markdown("""
+## 🧀🥛 Butter, Cheese, Milk – What Sells the Best?  
+
+Some products might bring in **higher revenue** than others. This chart shows:  
+- **Which dairy product is the biggest money-maker?** 💰  
+- **Do some products underperform?** 📉  
+- **Should farms focus on high-revenue products?**  
+""")
+
+# Show in Streamlit
+plot(figure('product_revenue', filters, currency), use_container_width=True, key="product_revenue")
+st.markdown("""
+### **Curd**
+Curd is a fermented dairy product made from milk. It is created by adding bacterial cultures to warm milk, which helps it coagulate. Curd is typically eaten plain or used as a side dish in meals.
+
+### **Lassi**
+Lassi is a yogurt-based drink, popular in India. It is made by blending yogurt with water, and can be either sweet or salted. Lassi is often flavored with fruits, spices, or herbs and is served chilled.
+""")
+
+st.markdown("## 🛑 Expiration Risk Analysis")
+st.markdown("When discussing milk products, it's important to mention their expiration times, as some spoil much faster than others. Proper storage and handling play a key role in maintaining their quality and preventing waste. It's also crucial to know which products are the most profitable and how long they can be stored to optimize sales and reduce losses.")
+# Show plot in Streamlit
+
+st.markdown("### How long do our dairy products last?")
+plot(figure('shelf_life', filters, currency), use_container_width=True, key="shelf_life")
+
+# Display in Streamlit
+st.markdown("## ⏳ Top 10 Fastest Expiring Products")
+st.markdown("These are the dairy products with the shortest shelf life. Quick sales strategies may be needed!")
+plot(figure('short_life_products', filters, currency), use_container_width=True, key="short_life_products")
+st.markdown("Curd is the best choice—it’s highly profitable and stays fresh for up to 5 days, while milk has a low profit margin and spoils within a day, making it much harder to manage.")
@@ -0,0 +1,58 @@
+import pandas as pd
+import streamlit as st
+
+from pages.caching import CACHES
+from pages.profiling import STAGES, records, to_jsonl
+
+st.markdown("# ⏱️ Performance")
+st.markdown("""
+Wall time, rows, cache hit / miss and payload size of every stage of recent reruns
+(load, transform, aggregate, figure build and the `st.plotly_chart` send).
+Stages nest: a missed aggregate includes the load and transform it triggered.
+""")
+
+scope = st.radio("Sessions", ["This session", "All sessions"], horizontal=True)
+rows = records(st.session_state.get('profile_session') if scope == "This session" else None)
+if not rows:
+    st.info("Nothing recorded yet: open a section of the dashboard first.")
+    st.stop()
+
+stages = pd.DataFrame(rows)
+stages['time'] = pd.to_datetime(stages['time'], unit='s')
+stages['stage'] = pd.Categorical(stages['stage'], categories=STAGES, ordered=True)
+
+st.download_button("Download as JSON lines", to_jsonl(rows), file_name="profile.jsonl",
+                   mime="application/x-ndjson")
+
+# One line per rerun; nested stages are counted once, through their outermost stage
+st.markdown("## Reruns")
+stages['top_level_s'] = stages['seconds'].where(stages['depth'] == 0, 0)
+reruns = stages.groupby(['session', 'rerun'], dropna=False).agg(
+    started=('time', 'min'),
+    stages=('stage', 'size'),
+    seconds=('top_level_s', 'sum'),
+    misses=('cache', lambda cache: (cache == 'miss').sum()),
+    payload_kb=('payload_bytes', lambda payload: payload.sum() / 1024),
+)
+reruns = reruns.sort_values('started', ascending=False).reset_index()
+# Round only the numbers: .round() on the 'started' timestamps warns on every render
+st.dataframe(reruns.round(dict.fromkeys(reruns.select_dtypes('number').columns, 3)), hide_index=True)
+
+st.markdown("## Per stage")
+summary = stages.groupby(['stage', 'name'], observed=True).agg(
+    calls=('seconds', 'size'),
+    median_s=('seconds', 'median'),
+    p95_s=('seconds', lambda seconds: seconds.quantile(0.95)),
+    max_s=('seconds', 'max'),
+    hit_rate=('cache', lambda cache: (cache == 'hit').mean()),
+    rows=('rows', 'max'),
+    payload_kb=('payload_bytes', lambda payload: payload.max() / 1024),
+)
+st.dataframe(summary.sort_values('p95_s', ascending=False).reset_index().round(4), hide_index=True)
+
+st.markdown("## Caches")
+st.markdown("Counters since the server started; the disk tier is shared by every worker process.")
+st.dataframe(pd.DataFrame({name: cache.stats() for name, cache in CACHES.items()}).T.fillna(0).astype('int64'))
+
+st.markdown("## Latest stages")
+st.dataframe(stages.sort_values('time', ascending=False).head(200), hide_index=True)
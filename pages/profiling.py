@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+# Stage records kept in memory, process-wide (oldest dropped first)
+MAX_RECORDS = int(os.environ.get('SALES_PROFILE_RECORDS', 20_000))
+
+# Set SALES_PROFILE_LOG to a file path to also append every record to it as a JSON line
+PROFILE_LOG = os.environ.get('SALES_PROFILE_LOG')
+
+# Stages of a rerun, in the order the page goes through them
+STAGES = ['load', 'transform', 'aggregate', 'figure', 'send']
+
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+
+# Per thread: the rerun being recorded and the stack of open stages.
+# Each session's script runs in its own thread, as does the cache warmer.
+_local = threading.local()
+
+
+def begin_run(session=None):
+    """Start recording a new rerun; call once at the top of the script (or of a warm-up pass).
+
+    Without `session` the Streamlit session is used, identified by an id kept
+    in its session state.
+    """
+    if session is None:
+        session = st.session_state.setdefault('profile_session', uuid.uuid4().hex[:8])
+        rerun = st.session_state['profile_rerun'] = st.session_state.get('profile_rerun', 0) + 1
+    else:
+        rerun = getattr(_local, 'rerun', 0) + 1 if getattr(_local, 'session', None) == session else 1
+    _local.session, _local.rerun, _local.open = session, rerun, []
+
+
+@contextmanager
+def stage(kind, name, rows=None):
+    """Time a stage of the rerun; yields its record so the caller can fill in rows / payload bytes.
+
+    The cache field starts as 'hit' and is flipped by mark_miss() when the
+    stage's cached computation actually runs. 'depth' counts the stages open
+    around this one, so nested time is not counted twice.
+    """
+    opened = getattr(_local, 'open', None)
+    if opened is None:
+        opened = _local.open = []
+    record = {
+        'time': time.time(), 'session': getattr(_local, 'session', None), 'rerun': getattr(_local, 'rerun', None),
+        'stage': kind, 'name': name, 'depth': len(opened), 'seconds': None, 'rows': rows, 'cache': 'hit',
+        'payload_bytes': None,
+    }
+    opened.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = time.perf_counter() - start
+        opened.pop()
+        _store(record)
+
+
+def mark_miss():
+    """Mark the innermost open stage as a cache miss (call from inside the cached computation)."""
+    opened = getattr(_local, 'open', None)
+    if opened:
+        opened[-1]['cache'] = 'miss'
+
+
+def _store(record):
+    with _lock:
+        _records.append(record)
+        if PROFILE_LOG:
+            with open(PROFILE_LOG, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+
+def records(session=None):
+    """Recorded stages, oldest first, optionally for one session only."""
+    with _lock:
+        snapshot = list(_records)
+    return [r for r in snapshot if session is None or r['session'] == session]
+
+
+def to_jsonl(rows):
+    """Records as JSON lines, for download or offline analysis."""
+    return ''.join(json.dumps(row) + '\n' for row in rows)
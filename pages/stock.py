@@ -0,0 +1,52 @@
+import streamlit as st
+
+from pages.context import selection
+from pages.inventory import EXPIRY_HORIZON_DAYS, LEAD_TIME_DAYS, VELOCITY_DAYS, at_risk_inventory, inventory_kpis
+
+
+def rounded(table):
+    """Numbers to 2 decimals; the Last Record dates are left as they are."""
+    return table.round(dict.fromkeys(table.select_dtypes('number').columns, 2))
+
+
+currency, filters = selection()
+# Cached per (data version, filter state) and shared across sessions
+status = at_risk_inventory(filters)
+if status is None:
+    st.warning("No stock records match the selected filters.")
+    st.stop()
+
+st.markdown(f"""
+# 📦 At-Risk Inventory
+
+Which products are about to **run out**, and which stock is about to **expire**?  
+Each row is a product of a brand at a farm location, as of its latest stock record:  
+- **Days of Cover** = stock in hand ÷ average daily sales over the last **{VELOCITY_DAYS} days**  
+- **Stock-out Risk** is **High** below the minimum stock threshold or with less than **{LEAD_TIME_DAYS} days** of cover, **Medium** under {2 * LEAD_TIME_DAYS} days  
+- **Expiry Risk** is the share of recent stock already expired or expiring within **{EXPIRY_HORIZON_DAYS} days** of its record date  
+""")
+
+kpis = inventory_kpis(status)
+col1, col2, col3 = st.columns(3)
+col1.metric(label="🚨 High stock-out risk", value=f"{kpis['High Stock-out Risk']:,.0f}")
+col2.metric(label="📉 Below minimum threshold", value=f"{kpis['Below Minimum Threshold']:,.0f}")
+col3.metric(label="⏳ Avg. expiry risk", value=f"{kpis['Avg. Expiry Risk']:.0%}")
+
+st.markdown("## 🚨 Reorder Now")
+st.dataframe(
+    rounded(status[status['Stock-out Risk'] != 'Low'][[
+        'Product Name', 'Brand', 'Location', 'Stock-out Risk', 'Quantity in Stock (liters/kg)',
+        'Minimum Stock Threshold (liters/kg)', 'Reorder Quantity (liters/kg)', 'Daily Velocity', 'Days of Cover',
+        'Last Record',
+    ]]),
+    hide_index=True,
+)
+
+st.markdown("## ⏳ Highest Expiry Risk")
+st.dataframe(
+    rounded(status.nlargest(10, 'Expiry Risk')[[
+        'Product Name', 'Brand', 'Location', 'Expiry Risk', 'Expired Stock (liters/kg)',
+        'Expiring Stock (liters/kg)', 'Records',
+    ]]),
+    hide_index=True,
+)
@@ -0,0 +1,211 @@
+import glob
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+from pages.cube import build_cube, merge_cubes, merge_shelf_life, shelf_life_counts
+from pages.currency import rates_version
+from pages.data import DATA_PATH, PARSE_DTYPES, add_derived_columns, coerce_schema
+
+# Set SALES_STREAM_SOURCE to a CSV file or a directory of monthly CSV files to switch
+# the dashboard to streaming mode: the raw frame is never held, only the aggregates.
+STREAM_SOURCE = os.environ.get('SALES_STREAM_SOURCE')
+
+# Rows parsed per chunk; memory is bounded by this, not by the file size
+CHUNK_ROWS = int(os.environ.get('SALES_CHUNK_ROWS', 200_000))
+
+# A file untouched for this many seconds is taken as fully written, so a last row
+# without a trailing newline is counted
+SETTLE_SECONDS = float(os.environ.get('SALES_SETTLE_SECONDS', 60))
+
+
+def source_files(source=DATA_PATH):
+    """The CSV files behind a source: the file itself, or a directory's CSVs in name order."""
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    return [source]
+
+
+def source_version(source=DATA_PATH):
+    """Cheap fingerprint (names, sizes, mtimes) that never reads multi-GB files."""
+    digest = hashlib.sha1(rates_version().encode())
+    for path in source_files(source):
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def iter_chunks(source=DATA_PATH, chunk_rows=CHUNK_ROWS):
+    """Yield typed chunks of at most chunk_rows sales rows."""
+    for path in source_files(source):
+        with pd.read_csv(path, dtype=PARSE_DTYPES, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                yield add_derived_columns(coerce_schema(chunk, os.path.basename(path)))
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of a file, so pandas never sees a half-written row."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._file.readinto(memoryview(buffer)[:min(len(buffer), self._remaining)])
+        self._remaining -= n
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _complete_end(path, size):
+    """Offset just past the last newline: rows after it may still be being written."""
+    with open(path, 'rb') as f:
+        pos = size
+        while pos > 0:
+            step = min(1 << 16, pos)
+            f.seek(pos - step)
+            block = f.read(step)
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                return pos - step + newline + 1
+            pos -= step
+    return 0
+
+
+# Bytes of a file's head fingerprinted to detect it being rewritten rather than appended to
+HEAD_BYTES = 4096
+
+
+def _head_digest(path, length):
+    """Digest of the first `length` bytes; only bytes below the watermark, which appends never change."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def iter_tail_chunks(path, start, end, chunk_rows=CHUNK_ROWS):
+    """Yield typed chunks for the complete rows in bytes [start, end) of an append-only CSV."""
+    with open(path) as f:
+        names = pd.read_csv(f, nrows=0).columns
+    with io.BufferedReader(_ByteRange(path, start, end)) as tail:
+        # Past the header the tail has no header line of its own
+        reader = pd.read_csv(
+            tail, names=names, header=None if start else 0,
+            dtype=PARSE_DTYPES, chunksize=chunk_rows,
+        )
+        with reader:
+            for chunk in reader:
+                yield add_derived_columns(coerce_schema(chunk, os.path.basename(path)))
+
+
+def iter_partials(chunks):
+    """Reduce each chunk to its partial cube and shelf-life counts, dropping the rows."""
+    for chunk in chunks:
+        yield build_cube(chunk), shelf_life_counts(chunk)
+
+
+def aggregate_stream(source=DATA_PATH, chunk_rows=CHUNK_ROWS):
+    """Fold the partial aggregates of every chunk into one (cube, shelf_life_counts)."""
+    cube = shelf_life = None
+    for part_cube, part_shelf_life in iter_partials(iter_chunks(source, chunk_rows)):
+        if cube is None:
+            cube, shelf_life = part_cube, part_shelf_life
+        else:
+            cube = merge_cubes([cube, part_cube])
+            shelf_life = merge_shelf_life([shelf_life, part_shelf_life])
+    return cube, shelf_life
+
+
+class IncrementalAggregates:
+    """Aggregates for an append-only source, advanced by parsing only the new bytes.
+
+    A watermark (byte offset of the last complete row, plus the length and
+    digest of the file head up to at most that offset) is kept per file. On
+    refresh only bytes past the watermark are parsed and merged into the
+    existing tables: the cube here, every section's table in
+    pages.tables.IncrementalTables. A file that shrank, disappeared or had its
+    head rewritten, or a change of exchange rates, triggers a full rebuild.
+
+    Bytes after the last newline are normally a row still being written and
+    wait for a later refresh. Only once the file has not been modified for
+    SETTLE_SECONDS are they taken as a final row without a trailing newline
+    and parsed too; an unchanged size between two refreshes proves nothing,
+    as one rerun refreshes several times.
+    """
+
+    def __init__(self, source, chunk_rows=CHUNK_ROWS, settle_seconds=SETTLE_SECONDS):
+        self.source = source
+        self.chunk_rows = chunk_rows
+        self.settle_seconds = settle_seconds
+        self.watermarks = {}  # path -> (offset, (head length, head digest))
+        self.cube = self.shelf_life = None
+        self.rates = None  # converted measures depend on the exchange rates too
+        self.as_of = None
+        self._lock = threading.Lock()
+
+    def _reset(self):
+        self.watermarks = {}
+        self.cube = self.shelf_life = None
+
+    def _partials(self, chunks):
+        return iter_partials(chunks)
+
+    def _merge(self, part_cube, part_shelf_life):
+        if self.cube is None:
+            self.cube, self.shelf_life = part_cube, part_shelf_life
+        else:
+            self.cube = merge_cubes([self.cube, part_cube])
+            self.shelf_life = merge_shelf_life([self.shelf_life, part_shelf_life])
+
+    def _result(self):
+        return self.cube, self.shelf_life
+
+    def refresh(self):
+        """Bring the aggregates up to date and return them (here: cube, shelf_life_counts)."""
+        with self._lock:
+            files = source_files(self.source)
+            if self.rates != rates_version():
+                self._reset()
+                self.rates = rates_version()
+            for path, (offset, (length, digest)) in list(self.watermarks.items()):
+                if path not in files or os.path.getsize(path) < offset or _head_digest(path, length) != digest:
+                    self._reset()
+                    break
+
+            for path in files:
+                offset, _ = self.watermarks.get(path, (0, None))
+                stat = os.stat(path)
+                size = stat.st_size
+                if size == offset:
+                    continue
+                end = _complete_end(path, size)
+                if end < size and time.time() - stat.st_mtime >= self.settle_seconds:
+                    end = size  # the writer is done: the unterminated last row is complete
+                if end > offset:
+                    for part in self._partials(iter_tail_chunks(path, offset, end, self.chunk_rows)):
+                        self._merge(*part)
+                    length = min(end, HEAD_BYTES)
+                    self.watermarks[path] = (end, (length, _head_digest(path, length)))
+            self.as_of = time.time()
+            return self._result()
+
+
+def load_stream_cube(source=STREAM_SOURCE, chunk_rows=CHUNK_ROWS):
+    """Return (cube, shelf_life_counts), parsing only rows appended since the last call.
+
+    They come from the same chunk pass as every other streamed table (see
+    pages.tables), so the source is parsed once however many sections read it.
+    """
+    from pages.tables import load_stream_tables  # it imports this module
+    tables = load_stream_tables(source, chunk_rows)
+    return (None, None) if tables is None else (tables.cube, tables.shelf_life)
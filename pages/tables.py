@@ -0,0 +1,65 @@
+from typing import NamedTuple
+
+import pandas as pd
+import streamlit as st
+
+from pages.cube import aggregate, merge_cubes, merge_shelf_life
+from pages.efficiency import farm_table, merge_tables, sales_table
+from pages.inventory import daily_stock, merge_daily
+from pages.parallel import WORKERS
+from pages.streaming import CHUNK_ROWS, STREAM_SOURCE, IncrementalAggregates
+from pages.timeseries import daily_series, merge_series
+
+
+class Aggregates(NamedTuple):
+    """Every table the sections read, built in one pass over the sales rows."""
+    cube: pd.DataFrame
+    shelf_life: pd.DataFrame
+    farms: pd.DataFrame
+    sales: pd.DataFrame
+    stock: pd.DataFrame  # daily stock table
+    series: pd.DataFrame  # daily time-series rollup
+
+    @classmethod
+    def of(cls, df, workers=WORKERS):
+        return cls(*aggregate(df, workers), farm_table(df), sales_table(df), daily_stock(df), daily_series(df))
+
+    def merge(self, other):
+        return Aggregates(
+            merge_cubes([self.cube, other.cube]), merge_shelf_life([self.shelf_life, other.shelf_life]),
+            *merge_tables([self.farms, other.farms], [self.sales, other.sales]),
+            merge_daily([self.stock, other.stock]), merge_series([self.series, other.series]),
+        )
+
+
+class IncrementalTables(IncrementalAggregates):
+    """Every table (Aggregates) for an append-only source, from a single parse of the new bytes."""
+
+    def __init__(self, source, chunk_rows=CHUNK_ROWS):
+        super().__init__(source, chunk_rows)
+        self.tables = None
+
+    def _reset(self):
+        super()._reset()
+        self.tables = None
+
+    def _partials(self, chunks):
+        for chunk in chunks:
+            yield (Aggregates.of(chunk, workers=1),)
+
+    def _merge(self, part):
+        self.tables = part if self.tables is None else self.tables.merge(part)
+
+    def _result(self):
+        return self.tables
+
+
+@st.cache_resource(show_spinner=False)
+def _incremental_tables(source, chunk_rows):
+    """One watermarked set of tables per streamed source, shared by every session and section."""
+    return IncrementalTables(source, chunk_rows)
+
+
+def load_stream_tables(source=STREAM_SOURCE, chunk_rows=CHUNK_ROWS):
+    """Aggregates of the streamed source (None before any rows), parsing only rows appended since the last call."""
+    return _incremental_tables(source, chunk_rows).refresh()
@@ -0,0 +1,30 @@
+import streamlit as st
+
+st.markdown("""
+#  Key Takeaways from the Data  
+
+## 🚜 Best Farms & Livestock  
+- The **largest farms with the most cows** perform the best in terms of profitability.  
+
+## Main Consumers  
+- **Delhi** and **Chhattisgarh** are the top consumer regions.To further boost sales, offering free online delivery or discounts on bulk purchases could attract more customers and enhance market reach.
+
+## 🥛 Top 3 Products  
+1. **Curd**  
+2. **Butter**  
+3. **Lassi**  
+We need to explore better storage solutions for curd to extend its shelf life, maintain quality, and create more space for increased storage capacity.
+*(Milk is not very profitable and difficult to store & maintain.)*  
+
+##  Best Sales Channel  
+- **Retail outperforms both online and offline sales.- There's **not a huge difference** between online and offline sales, indicating **potential for growth** in both channels**  
+
+##  Best Month for Sales  
+- **June** has the highest sales, aligning with public holidays in India.  
+
+
+ 
+
+---
+
+""")
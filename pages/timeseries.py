@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+from pages.caching import LRUCache, cached
+from pages.currency import CURRENCIES, revenue_column
+from pages.data import DATA_PATH, dataset_version, load_sales
+from pages.engines import TableSpec, query_engine
+from pages.filters import FILTER_COLUMNS
+from pages.streaming import STREAM_SOURCE
+
+# Dimensions every rollup keeps, so a series can be split (and filtered) by any of them;
+# Brand also lets batch reports slice the series per brand like the cube
+SERIES_KEYS = FILTER_COLUMNS + ['Brand']
+
+# Revenue in every display currency plus the quantity sold, all summed
+SERIES_MEASURES = [revenue_column(currency) for currency in CURRENCIES] + ['Quantity Sold (liters/kg)']
+
+# UI label -> pandas period frequency
+GRANULARITIES = {'Day': 'D', 'Week': 'W', 'Month': 'M', 'Quarter': 'Q'}
+
+# Each level is rolled up from the finer level named here, never from raw rows.
+# Weeks straddle month boundaries, so months are rolled up from days.
+DERIVED_FROM = {'W': 'D', 'M': 'D', 'Q': 'M'}
+
+# Buckets a year back, for year-over-year growth
+PERIODS_PER_YEAR = {'D': 365, 'W': 52, 'M': 12, 'Q': 4}
+
+# Moving averages over the daily series
+MOVING_AVERAGE_DAYS = [7, 30]
+
+# Rollup levels per (engine, data version, filter state), and metric frames per
+# (engine, data version, filter state, frequency, measure, split), shared across sessions
+_rollups = LRUCache(max_entries=32, max_bytes=512 * 2**20, name='time-series rollups')
+_series = LRUCache(max_entries=256, max_bytes=128 * 2**20, name='time-series metrics')
+
+
+def daily_series(df):
+    """Reduce sales rows to one row per day x location x channel x product x brand."""
+    return df.groupby(['Date'] + SERIES_KEYS, observed=True, sort=False)[SERIES_MEASURES].sum().reset_index()
+
+
+def merge_series(tables):
+    """Combine partial rollups (e.g. daily tables from separate chunks) into one, exactly."""
+    merged = pd.concat(tables, ignore_index=True)
+    merged = merged.groupby(['Date'] + SERIES_KEYS, observed=True, sort=False)[SERIES_MEASURES].sum().reset_index()
+    # Concatenating categoricals with different categories falls back to object
+    for key in SERIES_KEYS:
+        merged[key] = merged[key].astype('category')
+    return merged
+
+
+def roll_up(table, freq):
+    """Re-bucket a finer rollup to `freq`, keyed by each bucket's first day."""
+    bucket = table['Date'].dt.to_period(freq).dt.start_time.rename('Date')
+    keys = [bucket] + [table[key] for key in SERIES_KEYS]
+    return table.groupby(keys, observed=True, sort=False)[SERIES_MEASURES].sum().reset_index()
+
+
+def build_rollups(daily):
+    """{frequency: rollup} for every granularity, each derived from the next finer level."""
+    levels = {'D': daily}
+    for freq, finer in DERIVED_FROM.items():
+        levels[freq] = roll_up(levels[finer], freq)
+    return levels
+
+
+def series_metrics(table, freq, measure, by=None):
+    """Per-bucket totals of `measure` with cumulative totals, YoY growth and (daily) moving averages.
+
+    The rollup is pivoted to one column per `by` value (or a single column)
+    over the complete bucket range, empty buckets counting as zero, so every
+    metric is one vectorized operation over all the series at once. Returns a
+    long frame: Date, the `by` column if any, and one column per metric.
+    """
+    if by is None:
+        wide = table.groupby('Date')[measure].sum().to_frame()
+    else:
+        wide = table.pivot_table(index='Date', columns=by, values=measure, aggfunc='sum', observed=True)
+    buckets = pd.period_range(wide.index.min(), wide.index.max(), freq=freq).to_timestamp(how='start')
+    wide = wide.reindex(buckets).fillna(0)
+
+    values = wide.to_numpy(dtype=np.float64)
+    metrics = {'Value': values, 'Cumulative': values.cumsum(axis=0)}
+    if freq == 'D':
+        for days in MOVING_AVERAGE_DAYS:
+            metrics[f'{days}-day MA'] = wide.rolling(days, min_periods=1).mean().to_numpy()
+    previous = wide.shift(PERIODS_PER_YEAR[freq]).to_numpy(dtype=np.float64)
+    metrics['YoY Growth'] = np.divide(values, previous, out=np.full(values.shape, np.nan),
+                                      where=previous > 0) - 1
+
+    rows, columns = values.shape
+    out = pd.DataFrame({'Date': np.repeat(wide.index.to_numpy(), columns)})
+    if by is not None:
+        out[by] = np.tile(wide.columns.to_numpy(), rows)
+    for name, metric in metrics.items():
+        out[name] = metric.ravel()
+    return out
+
+
+@cached(spinner="Rolling up sales by day...")
+def _load_daily_series(path, version):
+    """Build the daily rollup once per dataset version."""
+    return daily_series(load_sales(path))
+
+
+def load_daily_series(path=DATA_PATH):
+    """The daily rollup of whatever feeds the dashboard."""
+    if STREAM_SOURCE:
+        from pages.tables import load_stream_tables  # it imports this module
+        tables = load_stream_tables()
+        return None if tables is None else tables.series
+    return _load_daily_series(path, dataset_version(path))
+
+
+# daily_series() for engines that push the groupby down to the raw rows
+DAILY_SERIES_TABLE = TableSpec('daily series', ['Date'] + SERIES_KEYS,
+                               {measure: f'SUM("{measure}")' for measure in SERIES_MEASURES}, load_daily_series)
+
+
+def rollups(filters):
+    """Every granularity's rollup for the filter state (None when no sales match)."""
+    engine = query_engine()
+
+    def compute():
+        daily = engine.table(DAILY_SERIES_TABLE, filters)
+        return None if daily is None or daily.empty else build_rollups(daily)
+
+    return _rollups.get_or_compute((engine.name, engine.version(), filters), compute)
+
+
+def time_series(filters, granularity, measure, by=None):
+    """series_metrics() at a granularity ('Day', 'Week', ...), memoized per selection.
+
+    The rollups are shared by every granularity, so switching only reads the
+    precomputed level: work proportional to its number of buckets.
+    """
+    freq = GRANULARITIES[granularity]
+    engine = query_engine()
+
+    def compute():
+        levels = rollups(filters)
+        return None if levels is None else series_metrics(levels[freq], freq, measure, by)
+
+    return _series.get_or_compute((engine.name, engine.version(), filters, freq, measure, by), compute)
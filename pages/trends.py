@@ -0,0 +1,35 @@
+import streamlit as st
+
+from pages.charts import figure, plot, timeseries_figure
+from pages.context import section_data
+from pages.currency import revenue_column
+from pages.timeseries import GRANULARITIES, SERIES_KEYS
+
+currency, filters, cube, shelf_life = section_data()
+
+st.markdown("# 📅 Revenue Trends")
+st.markdown("How revenue moves month by month, compared across the years.")
+
+# Figures are cached per (chart, dataset version, filters, currency) and shared across sessions
+plot(figure('monthly_revenue', filters, currency), use_container_width=True)
+
+st.markdown("## 📈 Revenue & Quantity Over Time")
+st.markdown("""
+Pick a **granularity**, what to plot and an optional split:  
+- **Value**: the total per bucket (the daily view overlays 7- and 30-day moving averages)  
+- **Cumulative**: the running total  
+- **YoY Growth**: change against the same bucket one year earlier  
+""")
+
+col1, col2, col3, col4 = st.columns(4)
+granularity = col1.selectbox("Granularity", list(GRANULARITIES), index=2)
+metric = col2.selectbox("Metric", ['Value', 'Cumulative', 'YoY Growth'])
+measure = col3.selectbox("Measure", [revenue_column(currency), 'Quantity Sold (liters/kg)'])
+by = col4.selectbox("Split by", [None] + SERIES_KEYS, format_func=lambda key: key or "Total")
+
+# Every granularity is rolled up once per filter state, so switching is a cache lookup
+series = timeseries_figure(filters, currency, granularity, metric, measure, by)
+if series is None:
+    st.info("No sales on the selected days: widen the date range to see the series.")
+else:
+    plot(series, use_container_width=True)
@@ -0,0 +1,89 @@
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+from pages.currency import CURRENCIES
+from pages.engines import query_engine
+from pages.filters import Filters
+from pages.inventory import at_risk_inventory
+from pages.profiling import begin_run
+from pages.timeseries import rollups
+
+# Seconds between background refreshes of the shared caches
+REFRESH_SECONDS = int(os.environ.get('SALES_REFRESH_SECONDS', 300))
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """Daemon thread that precomputes everything the unfiltered dashboard shows.
+
+    Each pass loads the data through the query engine, builds the cube,
+    every figure in every display currency, the at-risk inventory table and
+    the time-series rollups, so sessions read them from the shared caches
+    instead of computing them. Passes repeat every `interval` seconds; when
+    the data is unchanged they are all cache hits, when it has changed the
+    new version is computed here rather than in a user session.
+    """
+
+    def __init__(self, interval=REFRESH_SECONDS):
+        self.interval = interval
+        self.version = None
+        self.as_of = None  # when the warmed data version was first loaded
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name='sales-cache-warmer', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def warm(self):
+        """Populate the caches for the current data version."""
+        from pages.charts import CHARTS, efficiency_figure, figure  # plotly stays out of the entrypoint's imports
+
+        begin_run(session='warmer')
+        engine = query_engine()
+        version = engine.version()
+        options, _, _ = engine.domain()
+        filters = Filters()
+        engine.cube(filters)
+        for currency in CURRENCIES:
+            for chart_id in CHARTS:
+                if chart_id == 'top_farm_channel_pie':
+                    for channel in options['Sales Channel']:
+                        figure(chart_id, filters, currency, channel)
+                else:
+                    figure(chart_id, filters, currency)
+            efficiency_figure(filters, currency)
+        at_risk_inventory(filters)
+        rollups(filters)
+        if version != self.version:
+            self.version, self.as_of = version, time.time()
+
+    def _run(self):
+        while True:
+            try:
+                self.warm()
+                self.error = None
+            except Exception as exc:  # keep refreshing; sessions fall back to computing on demand
+                logger.exception("Cache warm-up failed")
+                self.error = exc
+            time.sleep(self.interval)
+
+
+@st.cache_resource(show_spinner=False)
+def cache_warmer():
+    """The process-wide warmer, started by the first script run after the server starts."""
+    return CacheWarmer().start()
+
+
+def sidebar_data_as_of():
+    """Show when the data behind the dashboard was last refreshed."""
+    warmer = cache_warmer()
+    if warmer.as_of is None:
+        st.sidebar.caption("⏳ Preparing the data…")
+    else:
+        st.sidebar.caption(f"Data as of {time.strftime('%Y-%m-%d %H:%M', time.localtime(warmer.as_of))}")